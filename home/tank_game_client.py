@@ -10,26 +10,38 @@ Core principles:
 """
 
 import asyncio
-import json
 import math
 import os
 import sys
 import time
-import uuid
 import socket
-from typing import Dict, Optional, List, Any
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import Dict, Optional, List, Any, Tuple
 import pygame
 import websockets
 from websockets.client import WebSocketClientProtocol
 from dotenv import load_dotenv
 import argparse
+import functools
+import logging
+
+# Faster event loop (optional) - uvloop on POSIX, its winloop port on Windows
+try:
+    if sys.platform == 'win32':
+        import winloop as uvloop
+    else:
+        import uvloop
+except ImportError:
+    uvloop = None
 
 # Add shared directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
 from tank_game_messages import *
 # Import shared entity classes
-from tank_game_entities import Player, Bullet
+from tank_game_entities import Player, apply_movement
+from bullet_pool import BulletPool
 # Import state machine system
 from game_states import GameStateManager, GameStateType
 from game_state_implementations import MainMenuState, ServerBrowserState, RoomLobbyState, InGameState
@@ -37,8 +49,12 @@ from game_state_implementations import MainMenuState, ServerBrowserState, RoomLo
 # Load environment variables - use shared .env file from project root
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+# Per-message/per-frame diagnostics go through debug logging (LOG_LEVEL=DEBUG to see them)
+log = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=None)
 def get_local_ip():
-    """Get local machine IP address"""
+    """Get local machine IP address (looked up once, on first use)"""
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) # Create a fake UDP connection to Google DNS
         s.connect(("8.8.8.8", 80)) #Google DNS, safe and reliable
@@ -64,12 +80,12 @@ TANK_SPEED = int(os.getenv('TANK_SPEED', 300))
 DEFAULT_FONT_PATH = os.getenv('DEFAULT_FONT_PATH', None)
 
 # Server connection configuration - use real IP address
-DEFAULT_LOCAL_IP = get_local_ip()
 SERVER_PORT = int(os.getenv('SERVER_PORT', 8765))
-DEFAULT_SERVER_URL = f"ws://{DEFAULT_LOCAL_IP}:{SERVER_PORT}"
 
 
-print(f"🌐 Auto-detected local IP: {DEFAULT_LOCAL_IP}")
+def default_server_url() -> str:
+    """SERVER_URL from the environment, else this machine's IP (resolved lazily, not at import)"""
+    return os.getenv('SERVER_URL') or f"ws://{get_local_ip()}:{SERVER_PORT}"
 
 # Color definitions
 COLORS = {
@@ -84,14 +100,83 @@ COLORS = {
     'ORANGE': (255, 165, 0),
 }
 
+# Half-size of the pre-baked bullet sprite (bullet radius)
+BULLET_SPRITE_RADIUS = 4
+
+# Number of discrete health-bar fill levels (plus the empty bar)
+HEALTH_BAR_STEPS = 10
+
+# Movement keys - key_states names in GameClient._input_bits bit order
+MOVEMENT_KEYS = ('w', 'a', 's', 'd')
+
+# moving_directions dict for every movement bitmask - shared, treat as read-only
+DIRECTIONS_BY_BITS = tuple(
+    {key: bool(bits & (1 << i)) for i, key in enumerate(MOVEMENT_KEYS)} for bits in range(1 << len(MOVEMENT_KEYS))
+)
+
+# Players further than this outside the screen are skipped before anything is handed to SDL
+# (covers the 30px tank, the name label above it and the health bar)
+RENDER_CULL_MARGIN = 60
+
+# Most messages the writer packs into one outgoing frame - bounds frame size after a backlog
+MAX_MESSAGES_PER_FRAME = 16
+
+# Partial frames with more dirty rects than this are presented with a full flip instead
+DIRTY_RECT_LIMIT = 128
+# ...or whose rects add up to more than half the screen (overlaps counted twice - errs toward flip)
+DIRTY_AREA_LIMIT = SCREEN_WIDTH * SCREEN_HEIGHT // 2
+
+# Seconds between rebuilds of the in-game position sync debug panel
+SYNC_DEBUG_INTERVAL = 0.25
+
+# Event types the game loop pulls from the queue in typed groups
+QUIT = pygame.QUIT
+KEYDOWN = pygame.KEYDOWN
+K_ESCAPE = pygame.K_ESCAPE
+KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION)
+# The OS may have thrown away the window contents - the next frame must repaint all of it
+WINDOW_EVENTS = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED, pygame.VIDEOEXPOSE)
+
+# Only event types the client actually handles are let into the SDL queue
+HANDLED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP,
+                  pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION) + WINDOW_EVENTS
+
 class GameClient:
     """Perfect game client - now uses state machine system"""
     
+    # Message type -> handler method name, shared by all instances
+    _HANDLER_NAMES = MappingProxyType({
+        GameMessageType.CONNECTION_ACK: 'handle_connection_ack',
+        GameMessageType.GAME_STATE_UPDATE: 'handle_game_state_update',
+        GameMessageType.KEY_STATE_CHANGE: 'handle_key_state_change',
+        GameMessageType.PLAYER_MOVE: 'handle_player_move',
+        GameMessageType.PLAYER_STOP: 'handle_player_stop',
+        GameMessageType.BULLET_FIRED: 'handle_bullet_fired',
+        GameMessageType.COLLISION: 'handle_collision',
+        GameMessageType.BULLET_DESTROYED: 'handle_bullet_destroyed',
+        GameMessageType.PLAYER_DEATH: 'handle_player_death',
+        GameMessageType.GAME_VICTORY: 'handle_game_victory',
+        GameMessageType.GAME_DEFEAT: 'handle_game_defeat',
+        GameMessageType.PLAYER_JOIN: 'handle_player_join',
+        GameMessageType.PLAYER_LEAVE: 'handle_player_leave',
+        GameMessageType.ROOM_CREATED: 'handle_room_created',
+        GameMessageType.ROOM_START_GAME: 'handle_room_start_game',
+        GameMessageType.ROOM_LIST: 'handle_room_list',
+        GameMessageType.ROOM_DISBANDED: 'handle_room_disbanded',
+        GameMessageType.SLOT_CHANGED: 'handle_slot_changed',
+        GameMessageType.PONG: 'handle_pong',
+        GameMessageType.ERROR: 'handle_error',
+    })
+    
     def __init__(self, server_url: str = None):
-        self.server_url = server_url or DEFAULT_SERVER_URL
+        self.server_url = server_url or default_server_url()
         self.websocket: Optional[WebSocketClientProtocol] = None
         self.connected = False
         
+        # Bound handlers, looked up once instead of per message
+        self._handlers = {msg_type: getattr(self, name) for msg_type, name in self._HANDLER_NAMES.items()}
+        
         # Client state
         self.client_id: Optional[str] = None
         self.player_id: Optional[str] = None
@@ -99,7 +184,10 @@ class GameClient:
         
         # Game state
         self.players: Dict[str, Player] = {}
-        self.bullets: Dict[str, Bullet] = {}
+        self.bullets = BulletPool()  # SoA bullet storage, vectorized update/render
+        
+        # Newest applied GAME_STATE_UPDATE frame_id (reset when entering a room lobby)
+        self.latest_frame_id = -1
         
         # Room list (for server browser)
         self.room_list: List[Dict[str, Any]] = []
@@ -108,13 +196,18 @@ class GameClient:
         self.game_result = None  # None, "victory", "defeat"
         self.game_result_data = None  # Store victory/defeat message data
         
-        # Input state - simplified key state machine
+        # Input state - mouse only; held movement keys live in _input_bits
         self.input_state = {
-            'w': False, 'a': False, 's': False, 'd': False,
             'mouse_clicked': False,
             'mouse_pos': (400, 300)
         }
-        self.last_input_state = self.input_state.copy()
+        self._input_bits = 0  # Movement keys held, one bit per MOVEMENT_KEYS entry
+        self._last_sent_bits = 0  # Movement keys in the last key event sent
+        self._bullet_seq = 0  # Per-client shot counter, bullet ids are "<player_id>-<seq>"
+        
+        # Client-side prediction - per-frame inputs not yet acknowledged by the server
+        self._input_seq = 0  # Sequence of the latest key event
+        self._input_history = deque(maxlen=FPS * 2)  # (seq, dt, directions), ~2s of frames
         
         # Ping related
         self.ping_sequence = 0
@@ -125,17 +218,37 @@ class GameClient:
         self.last_movement_send = 0
         self.movement_send_interval = 0.05  # 20 FPS send, reduced from 33 FPS
         self.position_change_threshold = 5.0  # Position change threshold
+        self._pending_key_event: Optional[KeyStateChangeMessage] = None  # Latest unsent key event
+        self._key_event_flusher_task: Optional[asyncio.Task] = None
+        self._key_event_ready: Optional[asyncio.Event] = None  # Set when a key event is pending
+        
+        # Inbound frames, (receive time, raw frame); the network task only appends,
+        # the game loop drains them once per frame
+        self._inbox: deque = deque()
+        self._recv_time = 0.0  # Receive time of the frame currently being handled
+        
+        # Outbound message queue and its writer task (created per connection)
+        self._out_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
         
         # Performance monitoring
         self.frame_count = 0
         self.fps_counter = 0
-        self.last_fps_time = time.time()
+        self.last_fps_time = time.monotonic()
+        
+        # Timestamps cached once per frame by game_loop: monotonic for local timing,
+        # wall clock for anything compared with server/bullet timestamps
+        self._now: float = time.monotonic()
+        self._wall_now: float = time.time()
         
         # Initialize Pygame
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(f"Tank Wars - Perfect Edition ✨ ({SCREEN_WIDTH}x{SCREEN_HEIGHT})")
-        self.clock = pygame.time.Clock()
+        
+        # Drop text-input/wheel and the other window events at the SDL layer instead of draining them every frame
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
         
         # Fonts
         try:
@@ -153,6 +266,44 @@ class GameClient:
         except Exception as e:
             print(f"⚠️ Error loading font: {e}, using default font")
         
+        # Pre-baked sprites: tanks (local one carries the orange marker) and bullets
+        self._tank_local = self._create_tank_sprite(COLORS['GREEN'], COLORS['ORANGE'])
+        self._tank_remote = self._create_tank_sprite(COLORS['BLUE'])
+        self.bullet_sprite = self._create_bullet_sprite()
+        
+        # Health bars pre-rendered at 0%, 10%, ..., 100%
+        self._hp_bars = [self._create_health_bar(i / HEALTH_BAR_STEPS) for i in range(HEALTH_BAR_STEPS + 1)]
+        
+        # Rendered text surfaces keyed by (text, font id, color), oldest dropped first
+        self._text_cache: OrderedDict = OrderedDict()
+        self._text_cache_size = 256
+        
+        # HUD header blit list, rebuilt only when a displayed value changes
+        self._hud_key = None
+        self._hud_blits: List = []
+        self._hud_bottom = 10
+        
+        # Dirty-rect tracking for partial frames: rects blitted this frame (None outside a
+        # partial frame) and last frame's rects (None when last frame wasn't tracked)
+        self._dirty: Optional[List[pygame.Rect]] = None
+        self._prev_dirty: Optional[List[pygame.Rect]] = None
+        
+        # Position sync debug panel blit list, rebuilt every SYNC_DEBUG_INTERVAL
+        self._sync_debug_blits: List = []
+        self._sync_debug_next = 0.0
+        self._sync_debug_y = None
+        
+        # Static labels and control hints, rendered once
+        self._optimization_surface = self.render_text("✨ PERFECT CLIENT", self.big_font, COLORS['CYAN'])
+        self._smooth_info_surface = self.render_text("Fixed Window + Zero Jitter + Perfect Sync", self.small_font, COLORS['CYAN'])
+        gray = COLORS['GRAY']
+        self._controls_blits = self._text_column(
+            [("WASD: Move", gray), ("Mouse: Aim & Shoot", gray), ("ESC: Quit", gray)],
+            self.small_font, SCREEN_WIDTH - 150, 10, 20)
+        self._in_game_controls_blits = self._text_column(
+            [("WASD: Move", gray), ("Mouse: Aim & Shoot", gray), ("ESC: Back to Room", gray)],
+            self.small_font, SCREEN_WIDTH - 150, 10, 20)
+        
         # Initialize state machine
         self.state_manager = GameStateManager()
         self._register_states()
@@ -162,6 +313,51 @@ class GameClient:
         
         print(f"✨ GameClient initialized for {self.server_url}")
     
+    def _create_tank_sprite(self, color, outline_color=None) -> pygame.Surface:
+        """Pre-bake a 30x30 tank body, optionally with a 3px outline"""
+        sprite = pygame.Surface((30, 30)).convert()
+        sprite.fill(color)
+        if outline_color is not None:
+            pygame.draw.rect(sprite, outline_color, sprite.get_rect(), 3)
+        return sprite
+    
+    def _create_health_bar(self, ratio: float) -> pygame.Surface:
+        """Pre-render a 30x4 health bar: red background, green fill for ratio"""
+        bar = pygame.Surface((30, 4)).convert()
+        bar.fill(COLORS['RED'])
+        bar.fill(COLORS['GREEN'], (0, 0, int(30 * ratio), 4))
+        return bar
+    
+    def _create_bullet_sprite(self) -> pygame.Surface:
+        """Pre-bake the bullet circles once so rendering is a plain blit"""
+        size = BULLET_SPRITE_RADIUS * 2 + 1
+        center = (BULLET_SPRITE_RADIUS, BULLET_SPRITE_RADIUS)
+        sprite = pygame.Surface((size, size)).convert()
+        sprite.fill(COLORS['BLACK'])
+        pygame.draw.circle(sprite, COLORS['YELLOW'], center, BULLET_SPRITE_RADIUS)
+        pygame.draw.circle(sprite, COLORS['WHITE'], center, BULLET_SPRITE_RADIUS // 2)
+        # RLE-encode the colorkey once - the sprite never changes and is blitted per bullet
+        sprite.set_colorkey(COLORS['BLACK'], pygame.RLEACCEL)
+        return sprite
+    
+    def _text_column(self, lines, font: pygame.font.Font, x: int, y: int, line_height: int) -> List:
+        """(surface, dest) blit list for [(text, color), ...] stacked downwards from (x, y)"""
+        return [(self.render_text(text, font, color), (x, y + i * line_height)) for i, (text, color) in enumerate(lines)]
+    
+    def render_text(self, text: str, font: pygame.font.Font, color) -> pygame.Surface:
+        """Render antialiased text, reusing the surface when the same string was drawn recently"""
+        key = (text, id(font), tuple(color))
+        surface = self._text_cache.get(key)
+        if surface is not None:
+            self._text_cache.move_to_end(key)
+            return surface
+        
+        surface = font.render(text, True, color).convert_alpha()
+        self._text_cache[key] = surface
+        if len(self._text_cache) > self._text_cache_size:
+            self._text_cache.popitem(last=False)
+        return surface
+    
     def _register_states(self):
         """Register game states"""
         # Set client reference for state manager, used for cleanup operations between states
@@ -193,17 +389,34 @@ class GameClient:
         """Connect to server - auto-connect during initialization"""
         try:
             print(f"🔗 Connecting to {self.server_url}...")
-            self.websocket = await websockets.connect(self.server_url)
+            # Small JSON frames: per-message deflate costs more CPU/latency than it saves
+            self.websocket = await websockets.connect(self.server_url, compression=None,
+                                                      subprotocols=SUPPORTED_SUBPROTOCOLS)
+            print(f"📦 Message framing: {self.websocket.subprotocol or 'json'}")
             self.connected = True
             print("✅ Connected to server")
             
             # Start message receiving loop
             asyncio.create_task(self.message_loop())
             
+            # Start key event flusher (sends on key edges, at most one key event per send interval)
+            self._key_event_ready = asyncio.Event()
+            self._key_event_flusher_task = asyncio.create_task(self._key_event_flusher())
+            
+            # Start outbound writer (everything queued since its last write goes out as one frame)
+            self._out_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._writer_loop())
+        
         except Exception as e:
             print(f"❌ Failed to connect: {e}")
             self.connected = False
     
+    async def __aenter__(self) -> 'GameClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+    
     async def disconnect(self):
         """Disconnect"""
         if self.connected and self.websocket and self.player_id:
@@ -221,28 +434,61 @@ class GameClient:
             except Exception as e:
                 print(f"⚠️ Error sending leave message: {e}")
         
+        if self._key_event_flusher_task:
+            self._key_event_flusher_task.cancel()
+            self._key_event_flusher_task = None
+        
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        
         if self.websocket:
             await self.websocket.close()
         self.connected = False
         print("🔌 Disconnected from server")
     
     async def send_message(self, message: GameMessage):
-        """Send message to server"""
+        """Queue message for the writer task, which sends it to the server"""
         if not self.websocket or not self.connected:
             return
         
-        try:
-            await self.websocket.send(message.to_json())
-        except Exception as e:
-            print(f"❌ Error sending message: {e}")
+        self._out_queue.put_nowait(message)
+    
+    async def _writer_loop(self):
+        """Drain the outbound queue, sending everything pending as a single frame"""
+        queue = self._out_queue
+        while self.connected:
+            batch = [await queue.get()]
+            while len(batch) < MAX_MESSAGES_PER_FRAME and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                await self.websocket.send(encode_client_frame(batch, self.websocket.subprotocol))
+            except websockets.exceptions.ConnectionClosed:
+                break
+            except Exception as e:
+                print(f"❌ Error sending message: {e}")
+    
+    async def _key_event_flusher(self):
+        """Send a key event as soon as one is pending, then hold off for one send interval
+        
+        Idle while no key changes; edges arriving during the hold-off collapse into the latest one.
+        """
+        while self.connected:
+            await self._key_event_ready.wait()
+            self._key_event_ready.clear()
+            key_event = self._pending_key_event
+            if key_event is not None:
+                self._pending_key_event = None
+                await self.send_message(key_event)
+            await asyncio.sleep(self.movement_send_interval)
     
     async def message_loop(self):
-        """Message receiving loop"""
+        """Message receiving loop - queues raw frames for process_inbox"""
+        inbox = self._inbox
         try:
             async for raw_message in self.websocket:
-                message = parse_message(raw_message)
-                if message:
-                    await self.handle_message(message)
+                inbox.append((time.monotonic(), raw_message))
         except websockets.exceptions.ConnectionClosed:
             print("🔌 Connection closed by server")
             self.connected = False
@@ -250,48 +496,39 @@ class GameClient:
             print(f"❌ Error in message loop: {e}")
             self.connected = False
     
+    async def process_inbox(self):
+        """Handle everything received since the last frame
+        
+        Game state updates are full snapshots, so of several in one drain only the newest is applied.
+        """
+        inbox = self._inbox
+        if not inbox:
+            return
+        
+        received = []
+        while inbox:
+            recv_time, raw_message = inbox.popleft()
+            received.extend((recv_time, message) for message in parse_messages(raw_message))
+        
+        last_state = None
+        for i, (_, message) in enumerate(received):
+            if message.type == GameMessageType.GAME_STATE_UPDATE:
+                last_state = i
+        
+        for i, (recv_time, message) in enumerate(received):
+            if message.type == GameMessageType.GAME_STATE_UPDATE and i != last_state:
+                continue
+            self._recv_time = recv_time
+            try:
+                await self.handle_message(message)
+            except Exception as e:
+                print(f"❌ Error handling {message.type}: {e}")
+    
     async def handle_message(self, message: GameMessage):
         """Handle received messages"""
-        if message.type == GameMessageType.CONNECTION_ACK:
-            await self.handle_connection_ack(message)
-        elif message.type == GameMessageType.GAME_STATE_UPDATE:
-            await self.handle_game_state_update(message)
-        elif message.type == GameMessageType.KEY_STATE_CHANGE:
-            await self.handle_key_state_change(message)
-        elif message.type == GameMessageType.PLAYER_MOVE:
-            await self.handle_player_move(message)
-        elif message.type == GameMessageType.PLAYER_STOP:
-            await self.handle_player_stop(message)
-        elif message.type == GameMessageType.BULLET_FIRED:
-            await self.handle_bullet_fired(message)
-        elif message.type == GameMessageType.COLLISION:
-            await self.handle_collision(message)
-        elif message.type == GameMessageType.BULLET_DESTROYED:
-            await self.handle_bullet_destroyed(message)
-        elif message.type == GameMessageType.PLAYER_DEATH:
-            await self.handle_player_death(message)
-        elif message.type == GameMessageType.GAME_VICTORY:
-            await self.handle_game_victory(message)
-        elif message.type == GameMessageType.GAME_DEFEAT:
-            await self.handle_game_defeat(message)
-        elif message.type == GameMessageType.PLAYER_JOIN:
-            await self.handle_player_join(message)
-        elif message.type == GameMessageType.PLAYER_LEAVE:
-            await self.handle_player_leave(message)
-        elif message.type == GameMessageType.ROOM_CREATED:
-            await self.handle_room_created(message)
-        elif message.type == GameMessageType.ROOM_START_GAME:
-            await self.handle_room_start_game(message)
-        elif message.type == GameMessageType.ROOM_LIST:
-            await self.handle_room_list(message)
-        elif message.type == GameMessageType.ROOM_DISBANDED:
-            await self.handle_room_disbanded(message)
-        elif message.type == GameMessageType.SLOT_CHANGED:
-            await self.handle_slot_changed(message)
-        elif message.type == GameMessageType.PONG:
-            await self.handle_pong(message)
-        elif message.type == GameMessageType.ERROR:
-            await self.handle_error(message)
+        handler = self._handlers.get(message.type)
+        if handler:
+            await handler(message)
         else:
             print(f"⚠️ Unhandled message type: {message.type}")
     
@@ -318,7 +555,10 @@ class GameClient:
     
     async def handle_game_state_update(self, message: GameStateUpdateMessage):
         """Handle game state update - 完全服务器权威"""
-        current_time = time.time()
+        # 丢弃过期快照：已应用过更新的帧，积压的旧状态无需再处理
+        if message.frame_id < self.latest_frame_id:
+            return
+        self.latest_frame_id = message.frame_id
         
         # Update player states - 完全信任服务器位置
         for player_data in message.players:
@@ -329,7 +569,7 @@ class GameClient:
                 if player_id == self.player_id:
                     # 本地玩家：接受服务器权威位置，停止客户端预测
                     self._apply_server_authoritative_state(player, player_data)
-                    print(f"🎮 Local player server sync: ({player.position['x']:.1f}, {player.position['y']:.1f})")
+                    log.debug("🎮 Local player server sync: (%.1f, %.1f)", player.position['x'], player.position['y'])
                 else:
                     # 远程玩家：完全使用服务器位置
                     self._apply_server_authoritative_state(player, player_data)
@@ -344,19 +584,17 @@ class GameClient:
         # Update bullet states (保持不变)
         server_bullets = {b['bullet_id']: b for b in message.bullets}
         
-        # Add new bullets
-        for bullet_id, bullet_data in server_bullets.items():
-            if bullet_id not in self.bullets:
-                self.bullets[bullet_id] = Bullet(bullet_data)
+        # Diff against the server set with key-view set operations (each result is a new set, safe to mutate the pool)
+        local_ids = self.bullets.ids()
         
         # Remove bullets that don't exist on server
-        bullets_to_remove = []
-        for bullet_id in self.bullets:
-            if bullet_id not in server_bullets:
-                bullets_to_remove.append(bullet_id)
+        for bullet_id in local_ids - server_bullets.keys():
+            self.bullets.remove(bullet_id)
         
-        for bullet_id in bullets_to_remove:
-            del self.bullets[bullet_id]
+        # Add new bullets
+        now = time.time()
+        for bullet_id in server_bullets.keys() - local_ids:
+            self.bullets.spawn(server_bullets[bullet_id], now)
         
         # If currently in room lobby state, update room display
         current_state = self.state_manager.get_current_state_type()
@@ -370,9 +608,9 @@ class GameClient:
     
     def _apply_server_authoritative_state(self, player: Player, player_data: Dict):
         """应用服务器权威状态 - 使用平滑插值"""
-        # 使用新的平滑插值方法
-        server_position = player_data['position'].copy()
-        server_directions = player_data.get('moving_directions', {"w": False, "a": False, "s": False, "d": False}).copy()
+        # 使用新的平滑插值方法（解析出的字典是新对象，直接使用）
+        server_position = player_data['position']
+        server_directions = player_data.get('moving_directions', {"w": False, "a": False, "s": False, "d": False})
         
         # 更新服务器权威状态
         player.update_from_server_authoritative(server_position, server_directions)
@@ -392,8 +630,11 @@ class GameClient:
         if message.player_id in self.players:
             player = self.players[message.player_id]
             
+            # 本地玩家：基于回传序号重放未确认输入（预测对账）
+            if message.player_id == self.player_id and message.sequence is not None and message.position:
+                self._reconcile_local_player(player, message.position, message.sequence, message.timestamp)
             # 更新玩家状态（基于服务器权威的按键事件）
-            if hasattr(player, 'update_from_key_event'):
+            elif hasattr(player, 'update_from_key_event'):
                 player.update_from_key_event(
                     message.key_states,
                     message.timestamp,
@@ -401,21 +642,33 @@ class GameClient:
                 )
             else:
                 # 兼容性处理
-                player.moving_directions = message.key_states.copy()
+                player.moving_directions = message.key_states
                 if message.position:
-                    player.position = message.position.copy()
+                    player.position = message.position
             
             # 调试信息
-            if message.player_id == self.player_id:
-                moving_keys = [k for k, v in message.key_states.items() if v]
-                if moving_keys:
-                    print(f"🎮 Local key confirmed: {moving_keys}")
-                else:
-                    print(f"🛑 Local key confirmed: stop")
-            else:
+            if log.isEnabledFor(logging.DEBUG):
                 moving_keys = [k for k, v in message.key_states.items() if v]
-                if moving_keys:
-                    print(f"🎮 Remote key event: {message.player_id} {moving_keys}")
+                if message.player_id == self.player_id:
+                    if moving_keys:
+                        log.debug("🎮 Local key confirmed: %s", moving_keys)
+                    else:
+                        log.debug("🛑 Local key confirmed: stop")
+                elif moving_keys:
+                    log.debug("🎮 Remote key event: %s %s", message.player_id, moving_keys)
+    
+    def _reconcile_local_player(self, player: Player, server_position: Dict[str, float], ack_seq: int, server_timestamp: float):
+        """Reconcile local prediction - replay inputs from ack_seq onward on top of the server position"""
+        history = self._input_history
+        while history and history[0][0] < ack_seq:
+            history.popleft()
+        
+        predicted = dict(server_position)
+        for _, dt, directions in history:
+            apply_movement(predicted, directions, dt)
+        
+        # Keeps current local key state; only corrects when prediction drifted past the threshold
+        player.update_from_key_event(player.moving_directions, server_timestamp, predicted)
     
     async def handle_player_move(self, message: PlayerMoveMessage):
         """Handle other player movement - 使用平滑插值"""
@@ -428,10 +681,10 @@ class GameClient:
                 
                 # 调试信息
                 if message.player_id == self.player_id:
-                    print(f"🎮 Local smooth move: server pos ({message.position['x']:.1f}, {message.position['y']:.1f})")
-                else:
+                    log.debug("🎮 Local smooth move: server pos (%.1f, %.1f)", message.position['x'], message.position['y'])
+                elif log.isEnabledFor(logging.DEBUG):
                     moving_keys = [k for k, v in message.direction.items() if v]
-                    print(f"🎮 Remote smooth move: {message.player_id} {moving_keys}")
+                    log.debug("🎮 Remote smooth move: %s %s", message.player_id, moving_keys)
             else:
                 # 只有方向信息，更新方向
                 player.moving_directions = message.direction
@@ -449,9 +702,9 @@ class GameClient:
                 player.update_from_server_authoritative(message.position, stop_directions)
                 
                 if message.player_id == self.player_id:
-                    print(f"🛑 Local smooth stop: server pos ({message.position['x']:.1f}, {message.position['y']:.1f})")
+                    log.debug("🛑 Local smooth stop: server pos (%.1f, %.1f)", message.position['x'], message.position['y'])
                 else:
-                    print(f"🛑 Remote smooth stop: {message.player_id}")
+                    log.debug("🛑 Remote smooth stop: %s", message.player_id)
             else:
                 # 只更新方向
                 player.moving_directions = stop_directions
@@ -460,13 +713,10 @@ class GameClient:
         """Handle bullet fired"""
         bullet_data = {
             'bullet_id': message.bullet_id,
-            'owner_id': message.owner_id,
             'position': message.start_position,
-            'velocity': message.velocity,
-            'damage': message.damage,
-            'created_time': time.time()
+            'velocity': message.velocity
         }
-        self.bullets[message.bullet_id] = Bullet(bullet_data)
+        self.bullets.spawn(bullet_data, time.time())
     
     async def handle_collision(self, message: CollisionMessage):
         """Handle collision events"""
@@ -477,8 +727,7 @@ class GameClient:
     
     async def handle_bullet_destroyed(self, message: BulletDestroyedMessage):
         """Handle bullet destruction"""
-        if message.bullet_id in self.bullets:
-            del self.bullets[message.bullet_id]
+        self.bullets.remove(message.bullet_id)
     
     async def handle_player_death(self, message: PlayerDeathMessage):
         """Handle player death"""
@@ -605,7 +854,8 @@ class GameClient:
     async def handle_pong(self, message: PongMessage):
         """Handle Pong response"""
         if message.sequence in self.ping_times:
-            ping_time = time.time() - self.ping_times[message.sequence]
+            # Measured to when the frame arrived, not to when the game loop got to it
+            ping_time = self._recv_time - self.ping_times[message.sequence]
             self.current_ping = int(ping_time * 1000)
             del self.ping_times[message.sequence]
     
@@ -619,7 +869,7 @@ class GameClient:
             return
         
         self.ping_sequence += 1
-        self.ping_times[self.ping_sequence] = time.time()
+        self.ping_times[self.ping_sequence] = self._now
         
         ping_message = PingMessage(
             client_id=self.client_id or "unknown",
@@ -629,44 +879,30 @@ class GameClient:
     
     def handle_input(self, event):
         """Handle input events - key event driven"""
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_w:
-                self.input_state['w'] = True
-            elif event.key == pygame.K_a:
-                self.input_state['a'] = True
-            elif event.key == pygame.K_s:
-                self.input_state['s'] = True
-            elif event.key == pygame.K_d:
-                self.input_state['d'] = True
-        
-        elif event.type == pygame.KEYUP:
-            if event.key == pygame.K_w:
-                self.input_state['w'] = False
-            elif event.key == pygame.K_a:
-                self.input_state['a'] = False
-            elif event.key == pygame.K_s:
-                self.input_state['s'] = False
-            elif event.key == pygame.K_d:
-                self.input_state['d'] = False
-        
-        elif event.type == pygame.MOUSEBUTTONDOWN:
+        # Movement keys are sampled per frame in poll_movement_keys
+        if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left click
                 self.input_state['mouse_clicked'] = True
-                print(f"🖱️ Mouse clicked at {event.pos}, state: connected={self.connected}, player_id={self.player_id}")
+                log.debug("🖱️ Mouse clicked at %s, state: connected=%s, player_id=%s", event.pos, self.connected, self.player_id)
         
         elif event.type == pygame.MOUSEMOTION:
             # Directly use mouse coordinates
             self.input_state['mouse_pos'] = event.pos
     
+    def poll_movement_keys(self):
+        """Sample held movement keys once per frame - a KEYUP missed while unfocused can't leave a key stuck"""
+        pressed = pygame.key.get_pressed()
+        self._input_bits = (pressed[pygame.K_w] | (pressed[pygame.K_a] << 1) |
+                            (pressed[pygame.K_s] << 2) | (pressed[pygame.K_d] << 3))
+    
     def update_fps_counter(self):
         """Update FPS counter"""
         self.frame_count += 1
-        current_time = time.time()
-        if current_time - self.last_fps_time >= 1.0:
+        if self._now - self.last_fps_time >= 1.0:
             self.fps_counter = self.frame_count
             self.frame_count = 0
-            self.last_fps_time = current_time
-
+            self.last_fps_time = self._now
+    
     def update_local_player(self, dt: float):
         """Update local player - 使用确定性位置计算"""
         if not self.player_id or self.player_id not in self.players:
@@ -674,33 +910,25 @@ class GameClient:
         
         local_player = self.players[self.player_id]
         
-        # 更新移动方向状态
-        local_player.moving_directions = {
-            'w': self.input_state['w'],
-            'a': self.input_state['a'],
-            's': self.input_state['s'],
-            'd': self.input_state['d']
-        }
+        # 更新移动方向状态（按位掩码查表，不再每帧新建字典）
+        local_player.moving_directions = DIRECTIONS_BY_BITS[self._input_bits]
+        
+        # 记录本帧输入，用于服务器回传后的重放对账
+        if self._input_bits:
+            self._input_history.append((self._input_seq, dt, local_player.moving_directions))
         
         # 使用确定性位置更新
-        if hasattr(local_player, 'update_deterministic_position'):
-            local_player.update_deterministic_position(dt)
-        else:
-            # 兼容性：使用传统方法
-            local_player.update_position(dt)
+        local_player.update_deterministic_position(dt, self._wall_now)
     
     async def send_key_state_if_changed(self):
         """发送按键状态变化 - 确定性同步的关键"""
         if not self.connected or not self.player_id or self.player_id not in self.players:
             return
         
-        # 检查按键状态是否变化
-        movement_keys = ['w', 'a', 's', 'd']
-        current_keys = {key: self.input_state[key] for key in movement_keys}
-        last_keys = {key: self.last_input_state[key] for key in movement_keys}
-        
-        # 只在按键状态真正变化时发送
-        if current_keys != last_keys:
+        # 只在按键状态真正变化时发送（单次整数比较）
+        input_bits = self._input_bits
+        if input_bits != self._last_sent_bits:
+            current_keys = DIRECTIONS_BY_BITS[input_bits]
             current_player = self.players[self.player_id]
             
             # 获取当前位置（用于服务器校验）
@@ -710,208 +938,101 @@ class GameClient:
                 current_position = current_player.position.copy()
             
             # 创建按键状态变化消息
-            from tank_game_messages import KeyStateChangeMessage
+            self._input_seq += 1
             key_event = KeyStateChangeMessage(
                 player_id=self.player_id,
                 key_states=current_keys,
                 timestamp=time.time(),
-                position=current_position
+                position=current_position,
+                sequence=self._input_seq
             )
             
-            await self.send_message(key_event)
+            # Queue for the flusher task - only the latest state within an interval is sent
+            self._pending_key_event = key_event
+            if self._key_event_ready is not None:
+                self._key_event_ready.set()
             
             # 更新记录
-            self.last_input_state = self.input_state.copy()
+            self._last_sent_bits = input_bits
             
             # 调试信息
-            moving_keys = [k for k, v in current_keys.items() if v]
-            if moving_keys:
-                print(f"📤 Key event: {moving_keys}")
-            else:
-                print(f"📤 Key event: stop")
+            if log.isEnabledFor(logging.DEBUG):
+                moving_keys = [k for k, v in current_keys.items() if v]
+                log.debug("📤 Key event: %s", moving_keys or "stop")
     
     def update_game_objects(self, dt: float):
         """Update game objects - 使用确定性位置更新"""
         # 更新所有远程玩家的确定性位置
+        local_player_id = self.player_id
         for player_id, player in self.players.items():
-            if player_id != self.player_id:  # 只更新远程玩家
-                if hasattr(player, 'update_deterministic_position'):
-                    player.update_deterministic_position(dt)
-                else:
-                    # 兼容性：使用传统方法
-                    player.update_position(dt)
+            if player_id != local_player_id:  # 只更新远程玩家
+                player.update_deterministic_position(dt, self._wall_now)
         
-        # 更新子弹位置（保持不变）
-        bullets_to_remove = []
-        for bullet_id, bullet in self.bullets.items():
-            if not bullet.update(dt):
-                bullets_to_remove.append(bullet_id)
-        
-        # 移除无效子弹
-        for bullet_id in bullets_to_remove:
-            del self.bullets[bullet_id]
+        # 更新子弹位置并移除无效子弹（向量化）
+        self.bullets.update(dt, self._wall_now)
     
     def render(self):
-        """Perfect render - draw directly on screen"""
+        """Perfect render - draw directly on screen (game_loop presents the frame)"""
         # Draw directly on screen
         self.screen.fill(COLORS['BLACK'])
         
-        # Render players
-        for player_id, player in self.players.items():
-            if not player.is_alive:
-                continue
-                
-            pos = player.position  # Use single position source
-            color = COLORS['GREEN'] if player_id == self.player_id else COLORS['BLUE']
-            
-            # Draw tank
-            tank_rect = pygame.Rect(pos['x'] - 15, pos['y'] - 15, 30, 30)
-            pygame.draw.rect(self.screen, color, tank_rect)
-            
-            # If local player, add special marker
-            if player_id == self.player_id:
-                pygame.draw.rect(self.screen, COLORS['ORANGE'], tank_rect, 3)
-            
-            # Draw player name
-            name_text = self.small_font.render(player.name, True, COLORS['WHITE'])
-            name_rect = name_text.get_rect(center=(pos['x'], pos['y'] - 25))
-            self.screen.blit(name_text, name_rect)
-            
-            # Draw health bar
-            if player.health < player.max_health:
-                health_ratio = player.health / player.max_health
-                health_width = 30
-                health_height = 4
-                
-                # Background
-                health_bg = pygame.Rect(pos['x'] - 15, pos['y'] - 35, health_width, health_height)
-                pygame.draw.rect(self.screen, COLORS['RED'], health_bg)
-                
-                # Health
-                health_fg = pygame.Rect(pos['x'] - 15, pos['y'] - 35, 
-                                      health_width * health_ratio, health_height)
-                pygame.draw.rect(self.screen, COLORS['GREEN'], health_fg)
-        
-        # Render bullets
-        for bullet in self.bullets.values():
-            pos = bullet.position
-            pygame.draw.circle(self.screen, COLORS['YELLOW'], 
-                             (int(pos['x']), int(pos['y'])), 4)
-            # Bullet center point
-            pygame.draw.circle(self.screen, COLORS['WHITE'], 
-                             (int(pos['x']), int(pos['y'])), 2)
+        # Render tanks, names and bullets
+        self.render_game_world()
         
         # Render UI
         self.render_ui()
-        
-        pygame.display.flip()
-        
-        # Update FPS count
-        self.update_fps_counter()
     
     def render_ui(self):
         """Render UI information"""
-        y_offset = 10
-        
-        # Connection status
-        status_text = "Connected" if self.connected else "Disconnected"
-        status_color = COLORS['GREEN'] if self.connected else COLORS['RED']
-        status_surface = self.font.render(f"Status: {status_text}", True, status_color)
-        self.screen.blit(status_surface, (10, y_offset))
-        y_offset += 25
-        
-        # Player info
-        if self.player_id:
-            player_text = f"Player: {self.player_name}"
-            player_surface = self.font.render(player_text, True, COLORS['WHITE'])
-            self.screen.blit(player_surface, (10, y_offset))
-            y_offset += 25
-        
-        # Network latency
-        ping_color = COLORS['GREEN'] if self.current_ping < 50 else COLORS['ORANGE'] if self.current_ping < 100 else COLORS['RED']
-        ping_text = f"Ping: {self.current_ping}ms"
-        ping_surface = self.font.render(ping_text, True, ping_color)
-        self.screen.blit(ping_surface, (10, y_offset))
-        y_offset += 25
-        
-        # FPS display
-        fps_color = COLORS['GREEN'] if self.fps_counter >= 55 else COLORS['ORANGE'] if self.fps_counter >= 30 else COLORS['RED']
-        fps_text = f"FPS: {self.fps_counter}"
-        fps_surface = self.font.render(fps_text, True, fps_color)
-        self.screen.blit(fps_surface, (10, y_offset))
-        y_offset += 25
-        
-        # Game statistics
-        stats_text = f"Players: {len(self.players)} | Bullets: {len(self.bullets)}"
-        stats_surface = self.font.render(stats_text, True, COLORS['WHITE'])
-        self.screen.blit(stats_surface, (10, y_offset))
-        y_offset += 25
-        
-        # Optimization info
-        optimization_text = "✨ PERFECT CLIENT"
-        opt_surface = self.big_font.render(optimization_text, True, COLORS['CYAN'])
-        self.screen.blit(opt_surface, (10, y_offset))
+        # Status / player / ping / FPS / statistics
+        y_offset = self._render_hud_header()
+        
+        # Optimization info (rendered once)
+        self.screen.blit(self._optimization_surface, (10, y_offset))
         y_offset += 35
         
-        smooth_info = "Fixed Window + Zero Jitter + Perfect Sync"
-        smooth_surface = self.small_font.render(smooth_info, True, COLORS['CYAN'])
-        self.screen.blit(smooth_surface, (10, y_offset))
+        self.screen.blit(self._smooth_info_surface, (10, y_offset))
         
         # Position info (debug)
         if self.player_id and self.player_id in self.players:
             pos = self.players[self.player_id].position
             pos_text = f"Position: ({pos['x']:.1f}, {pos['y']:.1f})"
-            pos_surface = self.small_font.render(pos_text, True, COLORS['GRAY'])
+            pos_surface = self.render_text(pos_text, self.small_font, COLORS['GRAY'])
             self.screen.blit(pos_surface, (10, y_offset + 25))
         
-        # Control instructions
-        controls = [
-            "WASD: Move",
-            "Mouse: Aim & Shoot",
-            "ESC: Quit"
-        ]
+        # Control instructions (rendered once)
+        self._blit_batch(self._controls_blits)
+    
+    def _render_hud_header(self) -> int:
+        """Blit the status/player/ping/FPS/statistics lines, return the y below them
+        
+        The blit list is only rebuilt when one of the displayed values changes.
+        """
+        player_name = self.player_name if self.player_id else None
+        hud_key = (self.connected, player_name, self.current_ping, self.fps_counter, len(self.players), len(self.bullets))
+        if hud_key != self._hud_key:
+            self._hud_key = hud_key
+            ping = self.current_ping
+            fps = self.fps_counter
+            
+            lines = [(f"Status: {'Connected' if self.connected else 'Disconnected'}",
+                      COLORS['GREEN'] if self.connected else COLORS['RED'])]
+            if player_name is not None:
+                lines.append((f"Player: {player_name}", COLORS['WHITE']))
+            lines.append((f"Ping: {ping}ms", COLORS['GREEN'] if ping < 50 else COLORS['ORANGE'] if ping < 100 else COLORS['RED']))
+            lines.append((f"FPS: {fps}", COLORS['GREEN'] if fps >= 55 else COLORS['ORANGE'] if fps >= 30 else COLORS['RED']))
+            lines.append((f"Players: {len(self.players)} | Bullets: {len(self.bullets)}", COLORS['WHITE']))
+            
+            self._hud_blits = self._text_column(lines, self.font, 10, 10, 25)
+            self._hud_bottom = 10 + 25 * len(lines)
         
-        for i, control in enumerate(controls):
-            control_surface = self.small_font.render(control, True, COLORS['GRAY'])
-            self.screen.blit(control_surface, (SCREEN_WIDTH - 150, 10 + i * 20))
-
+        self._blit_batch(self._hud_blits)
+        return self._hud_bottom
+    
     def render_in_game_ui(self):
         """Render in-game UI information"""
-        y_offset = 10
-        
-        # Connection status
-        status_text = "Connected" if self.connected else "Disconnected"
-        status_color = COLORS['GREEN'] if self.connected else COLORS['RED']
-        status_surface = self.font.render(f"Status: {status_text}", True, status_color)
-        self.screen.blit(status_surface, (10, y_offset))
-        y_offset += 25
-        
-        # Player info
-        if self.player_id:
-            player_text = f"Player: {self.player_name}"
-            player_surface = self.font.render(player_text, True, COLORS['WHITE'])
-            self.screen.blit(player_surface, (10, y_offset))
-            y_offset += 25
-        
-        # Network latency
-        ping_color = COLORS['GREEN'] if self.current_ping < 50 else COLORS['ORANGE'] if self.current_ping < 100 else COLORS['RED']
-        ping_text = f"Ping: {self.current_ping}ms"
-        ping_surface = self.font.render(ping_text, True, ping_color)
-        self.screen.blit(ping_surface, (10, y_offset))
-        y_offset += 25
-        
-        # FPS display
-        fps_color = COLORS['GREEN'] if self.fps_counter >= 55 else COLORS['ORANGE'] if self.fps_counter >= 30 else COLORS['RED']
-        fps_text = f"FPS: {self.fps_counter}"
-        fps_surface = self.font.render(fps_text, True, fps_color)
-        self.screen.blit(fps_surface, (10, y_offset))
-        y_offset += 25
-        
-        # Game statistics
-        stats_text = f"Players: {len(self.players)} | Bullets: {len(self.bullets)}"
-        stats_surface = self.font.render(stats_text, True, COLORS['WHITE'])
-        self.screen.blit(stats_surface, (10, y_offset))
-        y_offset += 25
+        # Status / player / ping / FPS / statistics
+        y_offset = self._render_hud_header()
         
         # Position sync debug info
         self._render_position_sync_debug(y_offset)
@@ -920,25 +1041,32 @@ class GameClient:
         if self.player_id and self.player_id in self.players:
             pos = self.players[self.player_id].position
             pos_text = f"Position: ({pos['x']:.1f}, {pos['y']:.1f})"
-            pos_surface = self.small_font.render(pos_text, True, COLORS['GRAY'])
-            self.screen.blit(pos_surface, (10, y_offset + 60))
-        
-        # Control instructions
-        controls = [
-            "WASD: Move",
-            "Mouse: Aim & Shoot",
-            "ESC: Back to Room"
-        ]
+            pos_surface = self.render_text(pos_text, self.small_font, COLORS['GRAY'])
+            self._blit_batch([(pos_surface, (10, y_offset + 60))])
         
-        for i, control in enumerate(controls):
-            control_surface = self.small_font.render(control, True, COLORS['GRAY'])
-            self.screen.blit(control_surface, (SCREEN_WIDTH - 150, 10 + i * 20))
+        # Control instructions (rendered once)
+        self._blit_batch(self._in_game_controls_blits)
     
     def _render_position_sync_debug(self, y_offset: int):
-        """渲染位置同步调试信息 - 确定性按键同步版本"""
+        """渲染位置同步调试信息 - 确定性按键同步版本
+        
+        The panel is rebuilt at most every SYNC_DEBUG_INTERVAL seconds; frames in between
+        re-blit the cached list instead of rescanning all players.
+        """
         if not self.players:
             return
         
+        if self._now >= self._sync_debug_next or y_offset != self._sync_debug_y:
+            self._sync_debug_next = self._now + SYNC_DEBUG_INTERVAL
+            self._sync_debug_y = y_offset
+            self._sync_debug_blits = self._build_position_sync_debug(y_offset)
+        
+        self._blit_batch(self._sync_debug_blits)
+    
+    def _build_position_sync_debug(self, y_offset: int) -> List:
+        """Build the position sync debug panel as a blit list"""
+        blits = []
+        
         # 统计所有玩家的同步状态
         all_players = list(self.players.values())
         
@@ -947,36 +1075,32 @@ class GameClient:
             sync_mode = "Deterministic Key-Event Sync"
             sync_color = COLORS['GREEN']
             sync_text = f"Sync Mode: {sync_mode}"
-            sync_surface = self.small_font.render(sync_text, True, sync_color)
-            self.screen.blit(sync_surface, (10, y_offset))
+            sync_surface = self.render_text(sync_text, self.small_font, sync_color)
+            blits.append((sync_surface, (10, y_offset)))
             
             # 显示玩家统计
-            local_player = next((p for pid, p in self.players.items() if pid == self.player_id), None)
+            local_player = self.players.get(self.player_id)
             remote_players = [p for pid, p in self.players.items() if pid != self.player_id]
             
             player_text = f"Players: {len(all_players)} (1 local, {len(remote_players)} remote)"
-            player_surface = self.small_font.render(player_text, True, COLORS['WHITE'])
-            self.screen.blit(player_surface, (10, y_offset + 15))
+            player_surface = self.render_text(player_text, self.small_font, COLORS['WHITE'])
+            blits.append((player_surface, (10, y_offset + 15)))
             
             # 显示按键同步状态
-            moving_players = 0
+            moving_players = sum(1 for player in all_players if any(player.moving_directions.values()))
             total_players = len(all_players)
             
-            for player in all_players:
-                if any(player.moving_directions.values()):
-                    moving_players += 1
-            
             # 显示移动统计
             move_text = f"Moving: {moving_players}/{total_players} players"
             move_color = COLORS['YELLOW'] if moving_players > 0 else COLORS['WHITE']
-            move_surface = self.small_font.render(move_text, True, move_color)
-            self.screen.blit(move_surface, (10, y_offset + 30))
+            move_surface = self.render_text(move_text, self.small_font, move_color)
+            blits.append((move_surface, (10, y_offset + 30)))
             
             # 显示网络优化信息
             network_text = "Network: Event-driven (Low traffic ✨)"
             network_color = COLORS['CYAN']
-            network_surface = self.small_font.render(network_text, True, network_color)
-            self.screen.blit(network_surface, (10, y_offset + 45))
+            network_surface = self.render_text(network_text, self.small_font, network_color)
+            blits.append((network_surface, (10, y_offset + 45)))
             
             # 显示本地玩家详细信息
             if local_player:
@@ -991,8 +1115,8 @@ class GameClient:
                     keys_text = "Keys: None"
                     keys_color = COLORS['GRAY']
                 
-                keys_surface = self.small_font.render(keys_text, True, keys_color)
-                self.screen.blit(keys_surface, (10, detail_y))
+                keys_surface = self.render_text(keys_text, self.small_font, keys_color)
+                blits.append((keys_surface, (10, detail_y)))
                 
                 # 显示位置信息
                 if hasattr(local_player, 'display_position'):
@@ -1008,13 +1132,13 @@ class GameClient:
                         base_text = f"Base: ({base_pos['x']:.1f}, {base_pos['y']:.1f}) | Age: {time_since_base:.2f}s"
                         
                         pos_color = COLORS['GREEN'] if time_since_base < 1.0 else COLORS['YELLOW']
-                        base_surface = self.small_font.render(base_text, True, pos_color)
-                        self.screen.blit(base_surface, (10, detail_y + 12))
+                        base_surface = self.render_text(base_text, self.small_font, pos_color)
+                        blits.append((base_surface, (10, detail_y + 12)))
                 else:
                     pos_text = f"Position: ({local_player.position['x']:.1f}, {local_player.position['y']:.1f})"
                 
-                pos_surface = self.small_font.render(pos_text, True, COLORS['WHITE'])
-                self.screen.blit(pos_surface, (10, detail_y + 24))
+                pos_surface = self.render_text(pos_text, self.small_font, COLORS['WHITE'])
+                blits.append((pos_surface, (10, detail_y + 24)))
                 
                 # 显示远程玩家信息（最多显示2个）
                 if remote_players:
@@ -1030,8 +1154,8 @@ class GameClient:
                             remote_text = f"Remote {i+1}: Stationary"
                             remote_color = COLORS['GRAY']
                         
-                        remote_surface = self.small_font.render(remote_text, True, remote_color)
-                        self.screen.blit(remote_surface, (10, remote_y))
+                        remote_surface = self.render_text(remote_text, self.small_font, remote_color)
+                        blits.append((remote_surface, (10, remote_y)))
                         
                         # 显示远程玩家位置
                         if hasattr(player, 'display_position'):
@@ -1039,72 +1163,138 @@ class GameClient:
                         else:
                             remote_pos_text = f"  Pos: ({player.position['x']:.1f}, {player.position['y']:.1f})"
                         
-                        remote_pos_surface = self.small_font.render(remote_pos_text, True, COLORS['GRAY'])
-                        self.screen.blit(remote_pos_surface, (10, remote_y + 12))
+                        remote_pos_surface = self.render_text(remote_pos_text, self.small_font, COLORS['GRAY'])
+                        blits.append((remote_pos_surface, (10, remote_y + 12)))
             
             # 显示优化效果
             optimization_y = y_offset + 150
             optimization_text = "✨ ZERO JITTER • PERFECT SYNC • LOW LATENCY"
-            opt_surface = self.small_font.render(optimization_text, True, COLORS['CYAN'])
-            self.screen.blit(opt_surface, (10, optimization_y))
-
+            opt_surface = self.render_text(optimization_text, self.small_font, COLORS['CYAN'])
+            blits.append((opt_surface, (10, optimization_y)))
+        
+        return blits
+    
+    def begin_partial_frame(self):
+        """Start a frame that only repaints what changed - clears last frame's blit rects, not the whole screen"""
+        if self._prev_dirty is None:
+            # Last frame wasn't tracked (menu, banner, first frame) - start from a clean screen
+            self.screen.fill(COLORS['BLACK'])
+        else:
+            fill = self.screen.fill
+            black = COLORS['BLACK']
+            for rect in self._prev_dirty:
+                fill(black, rect)
+        self._dirty = []
+    
+    def present_frame(self):
+        """Show the frame - display.update over last+current blit rects for partial frames, flip otherwise"""
+        dirty = self._dirty
+        prev_dirty = self._prev_dirty
+        if dirty is None or prev_dirty is None or len(dirty) + len(prev_dirty) > DIRTY_RECT_LIMIT:
+            pygame.display.flip()
+        else:
+            # Old rects expose the erased background, new ones the freshly drawn sprites
+            rects = prev_dirty + dirty
+            if sum(r.w * r.h for r in rects) > DIRTY_AREA_LIMIT:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        self._prev_dirty = dirty
+        self._dirty = None
+    
+    def _blit_batch(self, draw_list):
+        """Blit a list of (surface, dest) pairs in one call, recording their rects in a partial frame"""
+        if not draw_list:
+            return
+        if self._dirty is not None:
+            self._dirty.extend(self.screen.blits(draw_list))
+        elif hasattr(self.screen, 'fblits'):
+            # pygame-ce: fast path without per-blit rect results
+            self.screen.fblits(draw_list)
+        else:
+            self.screen.blits(draw_list, doreturn=False)
+    
+    def render_bullets(self):
+        """Blit every bullet from the shared pre-baked sprite in one batched call"""
+        if not self.bullets:
+            return
+        sprite = self.bullet_sprite
+        self._blit_batch([(sprite, pos) for pos in self.bullets.positions(BULLET_SPRITE_RADIUS)])
+    
     def render_game_world(self):
-        """Render game world (tanks, bullets, etc.)"""
-        # Render players
+        """Render game world (tanks, names, health bars, bullets) in a single batched blit"""
+        tank_blits = []
+        name_blits = []
+        health_blits = []
+        min_x = min_y = -RENDER_CULL_MARGIN
+        max_x = SCREEN_WIDTH + RENDER_CULL_MARGIN
+        max_y = SCREEN_HEIGHT + RENDER_CULL_MARGIN
+        
+        # Bind everything the per-player loop touches to locals once per frame
+        local_player_id = self.player_id
+        now = self._now
+        tank_local = self._tank_local
+        tank_remote = self._tank_remote
+        hp_bars = self._hp_bars
+        render_text = self.render_text
+        small_font = self.small_font
+        white = COLORS['WHITE']
+        add_tank = tank_blits.append
+        add_name = name_blits.append
+        add_health = health_blits.append
+        
         for player_id, player in self.players.items():
             if not player.is_alive:
                 continue
-                
-            pos = player.position  # Use single position source
-            color = COLORS['GREEN'] if player_id == self.player_id else COLORS['BLUE']
             
-            # Draw tank
-            tank_rect = pygame.Rect(pos['x'] - 15, pos['y'] - 15, 30, 30)
-            pygame.draw.rect(self.screen, color, tank_rect)
+            # Local player renders its predicted position; remote players blend across server corrections
+            if player_id == local_player_id:
+                pos = player.position
+                fx, fy = pos['x'], pos['y']
+                tank_sprite = tank_local
+            else:
+                fx, fy = player.render_position(now)
+                tank_sprite = tank_remote
+            x, y = int(fx), int(fy)
             
-            # If local player, add special marker
-            if player_id == self.player_id:
-                pygame.draw.rect(self.screen, COLORS['ORANGE'], tank_rect, 3)
+            # Off-screen: cheaper to skip here than to let SDL clip three blits
+            if not (min_x <= x <= max_x and min_y <= y <= max_y):
+                continue
             
-            # Draw player name
-            name_text = self.small_font.render(player.name, True, COLORS['WHITE'])
-            name_rect = name_text.get_rect(center=(pos['x'], pos['y'] - 25))
-            self.screen.blit(name_text, name_rect)
+            # Tank (pre-baked, local one has the orange marker)
+            add_tank((tank_sprite, (x - 15, y - 15)))
             
-            # Draw health bar
-            if player.health < player.max_health:
-                health_ratio = player.health / player.max_health
-                health_width = 30
-                health_height = 4
-                
-                # Background
-                health_bg = pygame.Rect(pos['x'] - 15, pos['y'] - 35, health_width, health_height)
-                pygame.draw.rect(self.screen, COLORS['RED'], health_bg)
-                
-                # Health
-                health_fg = pygame.Rect(pos['x'] - 15, pos['y'] - 35, 
-                                      health_width * health_ratio, health_height)
-                pygame.draw.rect(self.screen, COLORS['GREEN'], health_fg)
-        
-        # Render bullets
-        for bullet in self.bullets.values():
-            pos = bullet.position
-            pygame.draw.circle(self.screen, COLORS['YELLOW'], 
-                             (int(pos['x']), int(pos['y'])), 4)
-            # Bullet center point
-            pygame.draw.circle(self.screen, COLORS['WHITE'], 
-                             (int(pos['x']), int(pos['y'])), 2)
-
+            # Player name
+            name_text = render_text(player.name, small_font, white)
+            # Plain tuple dest centred above the tank - no Rect allocated per player per frame
+            add_name((name_text, (x - name_text.get_width() // 2, y - 25 - name_text.get_height() // 2)))
+            
+            # Health bar (nearest pre-rendered step)
+            health = player.health
+            max_health = player.max_health
+            if health < max_health:
+                step = round(max(0, health) / max_health * HEALTH_BAR_STEPS)
+                add_health((hp_bars[step], (x - 15, y - 35)))
+        
+        # Bullets last so they draw over tanks
+        draw_list = tank_blits + name_blits + health_blits
+        if self.bullets:
+            sprite = self.bullet_sprite
+            draw_list.extend([(sprite, pos) for pos in self.bullets.positions(BULLET_SPRITE_RADIUS)])
+        
+        # Whole world in one blits call - list order keeps the tank/name/health/bullet layering
+        self._blit_batch(draw_list)
+    
     def update_room_display(self, room_data: Dict[str, Any]):
         """Update room display (called by message handlers)"""
         room_lobby_state = self.state_manager.states.get(GameStateType.ROOM_LOBBY)
         if room_lobby_state and hasattr(room_lobby_state, 'update_room'):
             room_lobby_state.update_room(room_data)
-
+    
     async def send_shoot(self):
         """发送射击消息 - 使用确定性位置"""
         if not self.connected or not self.player_id or self.player_id not in self.players:
-            print(f"🚫 Cannot shoot: connected={self.connected}, player_id={self.player_id}")
+            log.debug("🚫 Cannot shoot: connected=%s, player_id=%s", self.connected, self.player_id)
             return
         
         # 使用当前显示位置作为射击位置
@@ -1116,24 +1306,25 @@ class GameClient:
         
         # Calculate shooting direction
         mouse_x, mouse_y = self.input_state['mouse_pos']
-        dx = mouse_x - shoot_position['x']
-        dy = mouse_y - shoot_position['y']
+        px, py = shoot_position['x'], shoot_position['y']
+        dx = mouse_x - px
+        dy = mouse_y - py
         
-        # Normalize direction vector
-        length = math.sqrt(dx * dx + dy * dy)
-        if length > 0:
-            dx /= length
-            dy /= length
+        # Normalize direction vector (zero vector stays zero)
+        inv_length = 1.0 / (math.hypot(dx, dy) or 1.0)
+        dx *= inv_length
+        dy *= inv_length
         
-        # Send shoot message
+        # Send shoot message - bullet id only needs to be unique per player
+        self._bullet_seq += 1
         shoot_message = PlayerShootMessage(
             player_id=self.player_id,
             position=shoot_position,
             direction={"x": dx, "y": dy},
-            bullet_id=str(uuid.uuid4())
+            bullet_id=f"{self.player_id}-{self._bullet_seq}"
         )
         await self.send_message(shoot_message)
-        print(f"💥 Shoot: pos=({shoot_position['x']:.1f}, {shoot_position['y']:.1f})")
+        log.debug("💥 Shoot: pos=(%.1f, %.1f) dir=(%.2f, %.2f)", px, py, dx, dy)
         
         # Reset click state
         self.input_state['mouse_clicked'] = False
@@ -1152,58 +1343,62 @@ async def game_loop(client: GameClient):
     
     running = True
     
+    # Frame pacing is done with asyncio.sleep so socket I/O keeps running while we wait
+    frame_interval = 1.0 / FPS
+    last_frame_time = next_frame_time = time.monotonic()
+    
     print("✨ Perfect Game Loop Started with State Machine!")
     print("🎯 Starting at Main Menu")
     
     while running:
-        current_time = time.time()
-        dt = client.clock.get_time() / 1000.0  # Convert to seconds
-        
-        # Handle PyGame events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        # Cache one monotonic timestamp for everything in this frame
+        current_time = client._now = time.monotonic()
+        client._wall_now = time.time()
+        dt = current_time - last_frame_time
+        last_frame_time = current_time
+        
+        # Handle PyGame events, one typed pygame.event.get() per category so there is
+        # no per-event type dispatch
+        state_manager = client.state_manager
+        
+        # Only the first call pumps SDL; the rest read the same snapshot of the queue
+        if pygame.event.get(QUIT):
+            running = False
+        
+        # Window exposed/restored/resized - stale OS pixels outside the dirty rects, force a full repaint
+        if pygame.event.get(WINDOW_EVENTS, pump=False):
+            client._prev_dirty = None
+        
+        # Keyboard events go to the state machine only - movement keys are polled per frame
+        for event in pygame.event.get(KEY_EVENTS, pump=False):
+            if not state_manager.handle_event(event) and event.type == KEYDOWN and event.key == K_ESCAPE:
+                # If state machine didn't handle ESC, exit game
                 running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    # ESC key handling delegated to state machine
-                    if not client.state_manager.handle_event(event):
-                        # If state machine didn't handle it, exit game
-                        running = False
-                else:
-                    # Other key events delegated to state machine
-                    client.state_manager.handle_event(event)
-                    # If in game state, also handle traditional input
-                    current_state = client.state_manager.get_current_state_type()
-                    if current_state == GameStateType.IN_GAME:
-                        client.handle_input(event)
-            elif event.type == pygame.KEYUP:
-                # Key release events
-                client.state_manager.handle_event(event)
-                current_state = client.state_manager.get_current_state_type()
-                if current_state == GameStateType.IN_GAME:
-                    client.handle_input(event)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # Mouse click events
-                client.state_manager.handle_event(event)
-                current_state = client.state_manager.get_current_state_type()
-                if current_state == GameStateType.IN_GAME:
-                    client.handle_input(event)
-            elif event.type == pygame.MOUSEMOTION:
-                # Mouse movement events
-                client.state_manager.handle_event(event)
-                current_state = client.state_manager.get_current_state_type()
-                if current_state == GameStateType.IN_GAME:
-                    client.handle_input(event)
-            else:
-                # All other events delegated to state machine
-                client.state_manager.handle_event(event)
+        
+        # Mouse events, also fed to the in-game input handler
+        for event in pygame.event.get(MOUSE_EVENTS, pump=False):
+            state_manager.handle_event(event)
+            if state_manager.get_current_state_type() == GameStateType.IN_GAME:
+                client.handle_input(event)
+        
+        # All other events delegated to state machine
+        for event in pygame.event.get(pump=False):
+            state_manager.handle_event(event)
         
         # Update state machine
-        client.state_manager.update(dt)
+        state_manager.update(dt)
+        
+        # Apply server messages received since the last frame
+        await client.process_inbox()
+        
+        # Read after events, update() and network handlers - any of them may have changed state
+        current_state = state_manager.get_current_state_type()
         
         # Only handle network and game logic when in game state
-        current_state = client.state_manager.get_current_state_type()
         if current_state == GameStateType.IN_GAME and client.connected:
+            # Snapshot movement keys for this frame
+            client.poll_movement_keys()
+            
             # Update local player (确定性位置计算)
             client.update_local_player(dt)
             
@@ -1222,28 +1417,24 @@ async def game_loop(client: GameClient):
             # Update game objects (确定性位置更新)
             client.update_game_objects(dt)
         
-        # Render current state
-        client.state_manager.render(client.screen)
+        # Render current state (the in-game state draws its own HUD)
+        state_manager.render(client.screen)
         
-        # Render additional UI info in game state
-        if current_state == GameStateType.IN_GAME:
-            client.render_in_game_ui()
-        
-        pygame.display.flip()
-        client.clock.tick(FPS)
+        # Present: the plain in-game view pushes only the rects that changed, everything else flips
+        client.present_frame()
         
         # Update FPS count
         client.update_fps_counter()
         
-        # Yield control to other coroutines
-        await asyncio.sleep(0.001)
+        # Wait out the rest of the frame budget; if behind, just yield and re-anchor
+        now = time.monotonic()
+        await asyncio.sleep(max(0.0, next_frame_time - now))
+        next_frame_time = max(now, next_frame_time) + frame_interval
     
-    # Disconnect
-    await client.disconnect()
     pygame.quit()
 
 
-def determine_server_url():
+async def determine_server_url():
     """Determine server URL - parse command line arguments and intelligently choose server"""
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Perfect Tank Game Client')
@@ -1259,7 +1450,7 @@ def determine_server_url():
     
     # If user requests network scan
     if args.scan:
-        display_connection_help()
+        await display_connection_help()
         return None  # Indicates program should exit
     
     # Determine server URL
@@ -1271,11 +1462,12 @@ def determine_server_url():
     else:
         # Smart default connection: first scan network for servers
         print("🔍 No server specified, scanning for available servers...")
-        available_servers = scan_local_servers()
+        available_servers = await scan_local_servers()
         
         if available_servers:
             # Prioritize non-local servers
-            remote_servers = [s for s in available_servers if s != DEFAULT_LOCAL_IP]
+            local_ip = get_local_ip()
+            remote_servers = [s for s in available_servers if s != local_ip]
             if remote_servers:
                 chosen_server = remote_servers[0]
                 server_url = f"ws://{chosen_server}:{SERVER_PORT}"
@@ -1286,107 +1478,177 @@ def determine_server_url():
                 print(f"🏠 Auto-selected local server: {available_servers[0]}")
         else:
             # No servers found, use local IP as fallback
-            server_url = DEFAULT_SERVER_URL
-            print(f"⚠️ No servers found, trying local server: {DEFAULT_LOCAL_IP}")
+            server_url = default_server_url()
+            print(f"⚠️ No servers found, trying local server: {server_url}")
             print("💡 If this fails, make sure server is running or use --host [SERVER_IP]")
     
     return server_url
 
 
-def scan_local_servers(port: int = 8765) -> List[str]:
-    """Scan game servers in local network"""
+async def _probe_server(ip: str, port: int, timeout: float) -> Optional[bool]:
+    """Try a TCP connection to ip:port - True if it connects, False if refused/unreachable,
+    None if it timed out (no answer yet, may just be slow)
+    
+    A bare non-blocking socket connected on the event loop - no stream/transport is built
+    around it, since the connection is closed right away either way.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        await asyncio.wait_for(asyncio.get_running_loop().sock_connect(sock, (ip, port)), timeout)
+    except asyncio.TimeoutError:
+        sock.close()
+        return None
+    except OSError:
+        sock.close()
+        return False
+    
+    # Connected: orderly FIN teardown before closing (peer may already have reset it)
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+    return True
+
+
+class _DiscoveryListener(asyncio.DatagramProtocol):
+    """Collects the addresses of servers answering a discovery broadcast"""
+    
+    def __init__(self):
+        # Insertion-ordered set - fastest responder first, duplicate replies collapse
+        self.servers: Dict[str, None] = {}
+    
+    def datagram_received(self, data: bytes, addr):
+        if data == DISCOVERY_REPLY:
+            self.servers[addr[0]] = None
+
+
+async def discover_servers(port: int = 8765, timeout: float = 0.3) -> List[str]:
+    """Broadcast one discovery query and collect the servers that answer within timeout"""
+    try:
+        transport, listener = await asyncio.get_running_loop().create_datagram_endpoint(
+            _DiscoveryListener, local_addr=('0.0.0.0', 0), allow_broadcast=True)
+    except OSError:
+        return []
+    try:
+        transport.sendto(DISCOVERY_QUERY, ('255.255.255.255', port))
+        await asyncio.sleep(timeout)
+    finally:
+        transport.close()
+    return list(listener.servers)
+
+
+@functools.lru_cache(maxsize=1)
+def _scan_candidates() -> Tuple[str, Tuple[str, ...]]:
+    """Local /24 network base and its host addresses to probe (none without a LAN address)
+    
+    Whole /24, local machine included - the probes are non-blocking connects on the event
+    loop's selector, so sweeping 254 hosts costs the same wall time as a handful.
+    """
     local_ip = get_local_ip()
     if local_ip == "127.0.0.1":
-        return []
+        return local_ip, ()
+    network_base = local_ip.rsplit('.', 1)[0]
+    return network_base, tuple(f"{network_base}.{host}" for host in range(1, 255))
+
+
+async def scan_local_servers(port: int = 8765) -> List[str]:
+    """Find game servers in local network
     
-    # Get network segment
-    ip_parts = local_ip.split('.')
-    network_base = f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}"
+    Asks by UDP broadcast first; only if nobody answers (older server, broadcast filtered)
+    are all candidates probed over TCP, concurrently.
+    """
+    available_servers = await discover_servers(port)
+    if available_servers:
+        print(f"✅ Found {len(available_servers)} server(s) on port {port}: {', '.join(available_servers)}")
+        return available_servers
+    
+    network_base, scan_ips = _scan_candidates()
+    if not scan_ips:
+        return []
     
     available_servers = []
     
     print(f"🔍 Scanning network {network_base}.x for game servers...")
     
-    # Scan common IP ranges (simplified version, only scan some IPs)
-    scan_ips = [
-        f"{network_base}.1",    # Router
-        f"{network_base}.100",  # Common server IP
-        f"{network_base}.101", 
-        f"{network_base}.102",
-        f"{network_base}.110",
-        f"{network_base}.200",
-        local_ip,  # Local machine
-    ]
-    
-    for ip in scan_ips:
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(0.5)  # 500ms timeout
-            result = s.connect_ex((ip, port))
-            s.close()
-            
-            if result == 0:
-                available_servers.append(ip)
-                print(f"✅ Found server at {ip}:{port}")
-        except Exception:
-            pass
+    # Two passes, each one timeout of wall time: LAN hosts answer well within 50ms, so the
+    # slow 500ms pass only runs when the fast one found nothing, and only re-probes the
+    # hosts that didn't answer at all (refused/unreachable ones are settled)
+    for timeout in (0.05, 0.5):
+        results = await asyncio.gather(*(_probe_server(ip, port, timeout) for ip in scan_ips))
+        available_servers = [ip for ip, found in zip(scan_ips, results) if found]
+        if available_servers:
+            print(f"✅ Found {len(available_servers)} server(s) on port {port}: {', '.join(available_servers)}")
+            break
+        scan_ips = [ip for ip, found in zip(scan_ips, results) if found is None]
     
     return available_servers
 
-def display_connection_help():
+async def display_connection_help():
     """Display connection help information"""
     local_ip = get_local_ip()
     print("=" * 40)
     print(f"📍 Your machine IP: {local_ip}")
-
     
-    servers = scan_local_servers()
     
+    servers = await scan_local_servers()
+    
+    # Collect the report and write it once
+    out = []
     if servers:
-        print(f"✅ Found {len(servers)} server(s):")
-        for server_ip in servers:
-            print(f"   • {server_ip}:8765")
-        print("💻 Connection commands:")
+        out.append(f"✅ Found {len(servers)} server(s):")
+        out.extend(f"   • {server_ip}:8765" for server_ip in servers)
+        out.append("💻 Connection commands:")
         for server_ip in servers:
             if server_ip == local_ip:
-                print(f"   • Local server:  python home/tank_game_client.py")
+                out.append("   • Local server:  python home/tank_game_client.py")
             else:
-                print(f"   • Remote server: python home/tank_game_client.py --host {server_ip}")
+                out.append(f"   • Remote server: python home/tank_game_client.py --host {server_ip}")
     else:
-        print("❌ No servers found on local network")
-
+        out.append("❌ No servers found on local network")
     
-    print("=" * 40)
+    
+    out.append("=" * 40)
+    print("\n".join(out))
 
 
 
+# Startup banner - depends only on config, so it is built once at import and written in one go
+_BAR = "=" * 50
+_BANNER = f"""✨ Starting Perfect Tank Game Client with State Machine...
+{_BAR}
+  • Fixed window size ({SCREEN_WIDTH}x{SCREEN_HEIGHT})
+  • State machine enabled
+{_BAR}"""
+
+
 async def main():
     """Main function - now starts state machine instead of directly connecting to server"""
-    print("✨ Starting Perfect Tank Game Client with State Machine...")
-    print("=" * 50)
-    print(f"  • Fixed window size ({SCREEN_WIDTH}x{SCREEN_HEIGHT})")
-    print(f"  • State machine enabled")
-    print("=" * 50)
-    server_url = determine_server_url()
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper(), format='%(message)s')
+    # Decorative, so only for a terminal - piped/logged output starts at the server selection
+    if sys.stdout.isatty():
+        print(_BANNER)
+    server_url = await determine_server_url()
     if server_url:
         print(f"🔗 Connecting to server: {server_url}")
     else:
         print("❌ No server found, exiting...")
         return
     
-    # Create client (but don't connect immediately)
-    client = GameClient(server_url)
-    
-    try:
-        # Start state machine game loop
-        await game_loop(client)
-    
-    except KeyboardInterrupt:
-        print("\n🛑 Client shutting down...")
-    
-    finally:
-        await client.disconnect()
+    # Client connects in the background; leaving the block disconnects it, however the loop ended
+    async with GameClient(server_url) as client:
+        try:
+            # Start state machine game loop
+            await game_loop(client)
+        
+        except KeyboardInterrupt:
+            print("\n🛑 Client shutting down...")
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main()) 
\ No newline at end of file
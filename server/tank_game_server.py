@@ -4,12 +4,13 @@ WebSocket server implementation for handling all game messages and managing game
 """
 
 import asyncio
-import json
+import logging
 import os
 import sys
 import time
 import uuid
 import socket
+from types import MappingProxyType
 from typing import Dict, List, Optional, Set
 import websockets
 from websockets.server import WebSocketServerProtocol
@@ -18,11 +19,20 @@ from dotenv import load_dotenv
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
 
+# Faster event loop (optional) - uvloop on POSIX, its winloop port on Windows
+try:
+    if sys.platform == 'win32':
+        import winloop as uvloop
+    else:
+        import uvloop
+except ImportError:
+    uvloop = None
+
 # Add shared directory to Python path - must be before importing custom modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'shared'))
 
 from tank_game_messages import (
-    GameMessage, GameMessageType, parse_message,
+    GameMessage, GameMessageType, parse_messages,
     PlayerMoveMessage, PlayerStopMessage, PlayerShootMessage,
     PlayerJoinMessage, PlayerLeaveMessage, GameStateUpdateMessage,
     PlayerPositionUpdateMessage, BulletFiredMessage, BulletHitMessage,
@@ -33,15 +43,20 @@ from tank_game_messages import (
     GameVictoryMessage, GameDefeatMessage,
     SlotChangeRequestMessage, SlotChangedMessage, RoomStartGameMessage,
     CreateRoomRequestMessage, RoomCreatedMessage, RoomListRequestMessage,
-    RoomListMessage, RoomDisbandedMessage, KeyStateChangeMessage
+    RoomListMessage, RoomDisbandedMessage, KeyStateChangeMessage,
+    SUPPORTED_SUBPROTOCOLS, json_dumpb, encode_batch,
+    DISCOVERY_QUERY, DISCOVERY_REPLY
 )
 
 # Import shared entity classes
-from tank_game_entities import Player, Bullet, GameRoom
+from tank_game_entities import Player, Bullet, GameRoom, apply_movement
 
 # Load environment variables - use shared .env file from project root
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+# Per-message diagnostics go through debug logging (LOG_LEVEL=DEBUG to see them)
+log = logging.getLogger(__name__)
+
 # Game configuration - keep consistent with client
 SCREEN_WIDTH = int(os.getenv('SCREEN_WIDTH', 800))
 SCREEN_HEIGHT = int(os.getenv('SCREEN_HEIGHT', 600))
@@ -165,7 +180,7 @@ class StatusHandler(SimpleHTTPRequestHandler):
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')  # Allow CORS
             self.end_headers()
-            self.wfile.write(json.dumps(status).encode())
+            self.wfile.write(json_dumpb(status))
             
             # Detailed debug information
             print(f"📊 Status query: {len(joinable_rooms)} joinable rooms, {joinable_players} joinable players")
@@ -180,8 +195,36 @@ class StatusHandler(SimpleHTTPRequestHandler):
         """Disable HTTP log output"""
         pass
 
+class DiscoveryResponder(asyncio.DatagramProtocol):
+    """Answers LAN discovery broadcasts so clients find the server without a TCP sweep"""
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def datagram_received(self, data: bytes, addr):
+        if data == DISCOVERY_QUERY:
+            self.transport.sendto(DISCOVERY_REPLY, addr)
+
+
 class TankGameServer:
     """Tank game server"""
+    
+    # Message type -> handler method name, shared by all instances
+    _HANDLER_NAMES = MappingProxyType({
+        GameMessageType.PLAYER_JOIN: 'handle_player_join',
+        GameMessageType.PLAYER_LEAVE: 'handle_player_leave',
+        GameMessageType.PLAYER_MOVE: 'handle_player_move',
+        GameMessageType.PLAYER_STOP: 'handle_player_stop',
+        GameMessageType.KEY_STATE_CHANGE: 'handle_key_state_change',  # 新增按键事件处理
+        GameMessageType.PLAYER_SHOOT: 'handle_player_shoot',
+        GameMessageType.PING: 'handle_ping',
+        GameMessageType.CREATE_ROOM_REQUEST: 'handle_create_room_request',
+        GameMessageType.ROOM_LIST_REQUEST: 'handle_room_list_request',
+        GameMessageType.ROOM_DISBANDED: 'handle_room_disbanded',
+        GameMessageType.SLOT_CHANGE_REQUEST: 'handle_slot_change_request',
+        GameMessageType.ROOM_START_GAME: 'handle_room_start_game',
+    })
+    
     def __init__(self, host: str = None, port: int = None):
         self.host = host if host is not None else SERVER_HOST
         self.port = port if port is not None else SERVER_PORT
@@ -193,6 +236,10 @@ class TankGameServer:
         self.game_loop_task: Optional[asyncio.Task] = None
         self.http_server = None
         self.http_thread = None
+        self.discovery_transport = None
+        
+        # Bound handlers, looked up once instead of per message
+        self._handlers = {msg_type: getattr(self, name) for msg_type, name in self._HANDLER_NAMES.items()}
         
         # Don't create default room - rooms should be created on demand
         
@@ -221,6 +268,17 @@ class TankGameServer:
         if self.http_thread:
             self.http_thread.join(timeout=1.0)
     
+    async def start_discovery_responder(self):
+        """Start UDP discovery responder on the game port number"""
+        try:
+            # Always the wildcard address, whatever self.host is - a socket bound to one
+            # interface address doesn't receive broadcast datagrams on Linux
+            self.discovery_transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                DiscoveryResponder, local_addr=('0.0.0.0', self.port))
+            print(f"📡 Discovery responder started on UDP port {self.port}")
+        except Exception as e:
+            print(f"⚠️ Failed to start discovery responder: {e}")
+    
     async def start(self):
         """Start server"""
         self.running = True
@@ -228,11 +286,16 @@ class TankGameServer:
         # Start HTTP status server
         self.start_status_server()
         
+        # Answer LAN discovery broadcasts
+        await self.start_discovery_responder()
+        
         # Start game loop
         self.game_loop_task = asyncio.create_task(self.game_loop())
         
         # Start WebSocket server
-        async with websockets.serve(self.handle_client, self.host, self.port):
+        # Small JSON frames: per-message deflate costs more CPU/latency than it saves
+        async with websockets.serve(self.handle_client, self.host, self.port, compression=None,
+                                    subprotocols=SUPPORTED_SUBPROTOCOLS):
             await asyncio.Future()  # Run forever
     
     async def stop(self):
@@ -240,6 +303,8 @@ class TankGameServer:
         self.running = False
         if self.game_loop_task:
             self.game_loop_task.cancel()
+        if self.discovery_transport:
+            self.discovery_transport.close()
         self.stop_status_server()
         print("🛑 Server stopped")
     
@@ -365,20 +430,21 @@ class TankGameServer:
             print("📊 No rooms remaining - all rooms cleaned up successfully")
     
     async def handle_message(self, websocket: WebSocketServerProtocol, client_id: str, raw_message: str):
-        """Handle client messages"""
+        """Handle client messages - a frame may carry a batch of messages"""
         try:
-            message = parse_message(raw_message)
-            if not message:
+            messages = parse_messages(raw_message)
+            if not messages:
                 error_msg = create_error_message("INVALID_MESSAGE", "Failed to parse message")
                 await self.send_message(websocket, error_msg)
                 return
             
-            # Reduce log noise - only log important messages
-            if message.type not in [GameMessageType.PING, GameMessageType.PLAYER_MOVE]:
-                print(f"📨 Received {message.type} from {client_id}")
-            
-            # Route message to corresponding handler
-            await self.route_message(websocket, client_id, message)
+            for message in messages:
+                # Reduce log noise - only log important messages
+                if message.type not in (GameMessageType.PING, GameMessageType.PLAYER_MOVE):
+                    log.debug("📨 Received %s from %s", message.type, client_id)
+                
+                # Route message to corresponding handler
+                await self.route_message(websocket, client_id, message)
             
         except Exception as e:
             print(f"❌ Error handling message from {client_id}: {e}")
@@ -387,22 +453,7 @@ class TankGameServer:
     
     async def route_message(self, websocket: WebSocketServerProtocol, client_id: str, message: GameMessage):
         """Route messages to corresponding handlers"""
-        handlers = {
-            GameMessageType.PLAYER_JOIN: self.handle_player_join,
-            GameMessageType.PLAYER_LEAVE: self.handle_player_leave,
-            GameMessageType.PLAYER_MOVE: self.handle_player_move,
-            GameMessageType.PLAYER_STOP: self.handle_player_stop,
-            GameMessageType.KEY_STATE_CHANGE: self.handle_key_state_change,  # 新增按键事件处理
-            GameMessageType.PLAYER_SHOOT: self.handle_player_shoot,
-            GameMessageType.PING: self.handle_ping,
-            GameMessageType.CREATE_ROOM_REQUEST: self.handle_create_room_request,
-            GameMessageType.ROOM_LIST_REQUEST: self.handle_room_list_request,
-            GameMessageType.ROOM_DISBANDED: self.handle_room_disbanded,
-            GameMessageType.SLOT_CHANGE_REQUEST: self.handle_slot_change_request,
-            GameMessageType.ROOM_START_GAME: self.handle_room_start_game,
-        }
-        
-        handler = handlers.get(message.type)
+        handler = self._handlers.get(message.type)
         if handler:
             await handler(websocket, client_id, message)
         else:
@@ -507,34 +558,16 @@ class TankGameServer:
                 # 广播给房间内所有玩家（包括发送者，确保位置一致）
                 await self.broadcast_to_room(player_room.room_id, authoritative_event)
                 
-                if directions_changed:
+                if directions_changed and log.isEnabledFor(logging.DEBUG):
                     moving_keys = [k for k, v in message.direction.items() if v]
-                    print(f"🎮 Server authoritative move: {client_id} {moving_keys} at ({player.position['x']:.1f}, {player.position['y']:.1f})")
+                    log.debug("🎮 Server authoritative move: %s %s at (%.1f, %.1f)", client_id, moving_keys, player.position['x'], player.position['y'])
             else:
                 print(f"⚠️ Player {client_id} not found in any room for movement")
     
     def _update_player_position_server_authoritative(self, player: Player, dt: float):
         """服务器权威位置计算 - 确保所有客户端看到相同结果"""
-        speed = TANK_SPEED
-        velocity = {"x": 0.0, "y": 0.0}
-        
-        # 基于移动方向计算速度（与客户端完全相同的算法）
-        if player.moving_directions["w"]:
-            velocity["y"] -= speed
-        if player.moving_directions["s"]:
-            velocity["y"] += speed
-        if player.moving_directions["a"]:
-            velocity["x"] -= speed
-        if player.moving_directions["d"]:
-            velocity["x"] += speed
-        
-        # 更新位置
-        player.position["x"] += velocity["x"] * dt
-        player.position["y"] += velocity["y"] * dt
-        
-        # 边界检查
-        player.position["x"] = max(0, min(SCREEN_WIDTH, player.position["x"]))
-        player.position["y"] = max(0, min(SCREEN_HEIGHT, player.position["y"]))
+        # 与客户端预测完全相同的共享算法
+        apply_movement(player.position, player.moving_directions, dt)
     
     async def handle_player_stop(self, websocket: WebSocketServerProtocol, client_id: str, message: PlayerStopMessage):
         """Handle player stop - 服务器权威停止位置"""
@@ -571,7 +604,7 @@ class TankGameServer:
                 
                 # 广播给房间内所有玩家（包括发送者）
                 await self.broadcast_to_room(player_room.room_id, authoritative_stop)
-                print(f"🛑 Server authoritative stop: {client_id} at ({player.position['x']:.1f}, {player.position['y']:.1f})")
+                log.debug("🛑 Server authoritative stop: %s at (%.1f, %.1f)", client_id, player.position['x'], player.position['y'])
             else:
                 print(f"⚠️ Player {client_id} not found in any room for stop")
     
@@ -615,7 +648,7 @@ class TankGameServer:
                 damage=bullet.damage
             )
             await self.broadcast_to_room(player_room.room_id, bullet_message)
-            print(f"💥 Player {client_id} fired bullet (no position sync)")
+            log.debug("💥 Player %s fired bullet (no position sync)", client_id)
         else:
             print(f"⚠️ Player {client_id} not found for shooting")
     
@@ -797,7 +830,14 @@ class TankGameServer:
     async def send_message(self, websocket: WebSocketServerProtocol, message: GameMessage):
         """Send message to client"""
         try:
-            await websocket.send(message.to_json())
+            await websocket.send(message.encode(websocket.subprotocol))
+        except Exception as e:
+            print(f"❌ Error sending message: {e}")
+    
+    async def send_batch(self, websocket: WebSocketServerProtocol, messages: List[GameMessage]):
+        """Send several messages to a client in one frame"""
+        try:
+            await websocket.send(encode_batch(messages, websocket.subprotocol))
         except Exception as e:
             print(f"❌ Error sending message: {e}")
     
@@ -826,26 +866,39 @@ class TankGameServer:
             await asyncio.gather(*tasks, return_exceptions=True)
     
     async def broadcast_events(self, room_id: str, events: List[GameMessage]):
-        """Broadcast event list"""
-        if not events:
+        """Broadcast event list - each player gets its share of the tick's events in one frame"""
+        if not events or room_id not in self.rooms:
             return
-            
+        
+        room = self.rooms[room_id]
+        outbox: Dict[str, List[GameMessage]] = {player_id: [] for player_id in room.players}
+        
         for event in events:
             # Handle victory/defeat messages - send to specific players
             if event.type == GameMessageType.GAME_VICTORY:
                 # Send victory message only to the winner
-                await self.send_message_to_player(event.winner_player_id, event)
+                outbox.setdefault(event.winner_player_id, []).append(event)
                 print(f"🏆 Victory message sent to {event.winner_player_name}")
             elif event.type == GameMessageType.GAME_DEFEAT:
                 # Send defeat message only to the eliminated player
-                await self.send_message_to_player(event.eliminated_player_id, event)
+                outbox.setdefault(event.eliminated_player_id, []).append(event)
                 print(f"💔 Defeat message sent to {event.eliminated_player_name}")
             else:
                 # Broadcast other events to all players in room
-                await self.broadcast_to_room(room_id, event)
+                for messages in outbox.values():
+                    messages.append(event)
                 # Reduce event broadcast logs
                 if event.type != GameMessageType.BULLET_DESTROYED:
-                    print(f"📡 Event {event.type} broadcasted to room {room_id}")
+                    log.debug("📡 Event %s broadcasted to room %s", event.type, room_id)
+        
+        tasks = []
+        for player_id, messages in outbox.items():
+            player = self.players.get(player_id)
+            if messages and player and player.websocket:
+                tasks.append(self.send_batch(player.websocket, messages))
+        
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
     
     async def handle_key_state_change(self, websocket: WebSocketServerProtocol, client_id: str, message):
         """处理按键状态变化 - 确定性同步的核心"""
@@ -889,19 +942,21 @@ class TankGameServer:
                     player_id=client_id,
                     key_states=message.key_states.copy(),
                     timestamp=current_time,  # 使用服务器时间戳
-                    position=player.position.copy()  # 服务器权威位置
+                    position=player.position.copy(),  # 服务器权威位置
+                    sequence=message.sequence  # 回传序号，供客户端对账
                 )
                 
                 # 广播给房间内所有玩家（包括发送者，确保时间戳一致）
                 await self.broadcast_to_room(player_room.room_id, authoritative_event)
                 
                 # 调试信息
-                moving_keys = [k for k, v in message.key_states.items() if v]
-                if moving_keys != [k for k, v in old_directions.items() if v]:
-                    if moving_keys:
-                        print(f"🎮 Key event: {client_id} pressing {moving_keys}")
-                    else:
-                        print(f"🛑 Key event: {client_id} stopped")
+                if log.isEnabledFor(logging.DEBUG):
+                    moving_keys = [k for k, v in message.key_states.items() if v]
+                    if moving_keys != [k for k, v in old_directions.items() if v]:
+                        if moving_keys:
+                            log.debug("🎮 Key event: %s pressing %s", client_id, moving_keys)
+                        else:
+                            log.debug("🛑 Key event: %s stopped", client_id)
             else:
                 print(f"⚠️ Player {client_id} not found in any room for key event")
         else:
@@ -914,8 +969,10 @@ class TankGameServer:
         
         print(f"🎮 Game loop started at {target_fps} FPS (Deterministic Key-Event Sync)")
         
+        # Ticks are scheduled against monotonic deadlines so sleep overshoot doesn't accumulate
+        next_tick_time = time.monotonic()
+        
         while self.running:
-            loop_start = time.time()
             
             # Update game state for all rooms
             for room in self.rooms.values():
@@ -942,10 +999,10 @@ class TankGameServer:
                             if state_update:
                                 await self.broadcast_to_room(room.room_id, state_update)
             
-            # Control frame rate
-            loop_time = time.time() - loop_start
-            sleep_time = max(0, dt - loop_time)
-            await asyncio.sleep(sleep_time)
+            # Control frame rate - wait out the rest of the tick; if behind, just yield and re-anchor
+            now = time.monotonic()
+            next_tick_time = max(now, next_tick_time + dt)
+            await asyncio.sleep(next_tick_time - now)
     
     def _update_all_players_deterministic(self, room, dt: float):
         """确定性更新所有玩家位置"""
@@ -982,11 +1039,12 @@ class TankGameServer:
             )
             
             await self.broadcast_to_room(room.room_id, correction_state)
-            print(f"🔧 Position correction: {len(corrections_needed)}/{len(room.players)} players, {len(room.bullets)} bullets")
+            log.debug("🔧 Position correction: %d/%d players, %d bullets", len(corrections_needed), len(room.players), len(room.bullets))
 
 
 async def main():
     """Main function"""
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper(), format='%(message)s')
     server = TankGameServer()
     try:
         display_server_info(SERVER_HOST, SERVER_PORT)
@@ -998,4 +1056,7 @@ async def main():
 
 if __name__ == "__main__":
     print("🎯 Starting Tank Game Server...")
-    asyncio.run(main()) 
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main()) 
\ No newline at end of file
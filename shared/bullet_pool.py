@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Client bullet pool
+
+Stores client-side bullets as Structure-of-Arrays (parallel numpy arrays) so the
+per-frame integration, lifetime/boundary culling and render pass are vectorized
+instead of iterating Bullet objects with dict positions
+"""
+
+from typing import Dict, Iterator, KeysView, List, Optional, Tuple
+import numpy as np
+
+from tank_game_entities import SCREEN_WIDTH, SCREEN_HEIGHT, BULLET_SPEED, BULLET_LIFETIME
+
+# JIT compiler (optional) - falls back to vectorized numpy when numba isn't installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _integrate_bullets(pos_x, pos_y, vel_x, vel_y, created_time, active, dt, now, max_lifetime, width, height):
+        """Integrate active bullets in place, return mask of out-of-bounds/expired ones"""
+        expired = np.zeros(pos_x.shape[0], dtype=np.bool_)
+        for i in range(pos_x.shape[0]):
+            if not active[i]:
+                continue
+            x = pos_x[i] + vel_x[i] * dt
+            y = pos_y[i] + vel_y[i] * dt
+            pos_x[i] = x
+            pos_y[i] = y
+            if x < 0 or x > width or y < 0 or y > height or now - created_time[i] > max_lifetime:
+                expired[i] = True
+        return expired
+else:
+    def _integrate_bullets(pos_x, pos_y, vel_x, vel_y, created_time, active, dt, now, max_lifetime, width, height):
+        """Integrate active bullets in place, return mask of out-of-bounds/expired ones"""
+        # Inactive slots have zero velocity, so integrating every slot is cheaper than masking
+        pos_x += vel_x * dt
+        pos_y += vel_y * dt
+        return active & (
+            (pos_x < 0) | (pos_x > width) |
+            (pos_y < 0) | (pos_y > height) |
+            (now - created_time > max_lifetime)
+        )
+
+
+class BulletPool:
+    """Bullet storage with one array per field and a bullet_id -> slot index"""
+    
+    def __init__(self, capacity: int = 128):
+        self.capacity = capacity
+        self.pos_x = np.zeros(capacity, dtype=np.float64)
+        self.pos_y = np.zeros(capacity, dtype=np.float64)
+        self.vel_x = np.zeros(capacity, dtype=np.float64)
+        self.vel_y = np.zeros(capacity, dtype=np.float64)
+        self.created_time = np.zeros(capacity, dtype=np.float64)
+        self.active = np.zeros(capacity, dtype=np.bool_)
+        self.max_lifetime = BULLET_LIFETIME
+        
+        self.index: Dict[str, int] = {}  # bullet_id -> slot
+        self.slot_ids: List[Optional[str]] = [None] * capacity
+        self.free_slots: List[int] = list(range(capacity - 1, -1, -1))
+        
+        # Compile (or load from numba's on-disk cache) now rather than on the first shot;
+        # every slot is inactive so this is a no-op on the arrays
+        if njit is not None:
+            self._integrate(0.0, 0.0)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def __contains__(self, bullet_id: str) -> bool:
+        return bullet_id in self.index
+    
+    def ids(self) -> KeysView[str]:
+        """IDs of active bullets"""
+        return self.index.keys()
+    
+    def _grow(self):
+        """Double capacity, keeping existing slots"""
+        old_capacity = self.capacity
+        self.capacity *= 2
+        for name in ('pos_x', 'pos_y', 'vel_x', 'vel_y', 'created_time', 'active'):
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        self.slot_ids.extend([None] * old_capacity)
+        self.free_slots.extend(range(self.capacity - 1, old_capacity - 1, -1))
+    
+    def spawn(self, bullet_data: Dict, created_time: float):
+        """Add or overwrite a bullet - accepts the same dict format as Bullet"""
+        bullet_id = bullet_data['bullet_id']
+        slot = self.index.get(bullet_id)
+        if slot is None:
+            if not self.free_slots:
+                self._grow()
+            slot = self.free_slots.pop()
+            self.index[bullet_id] = slot
+            self.slot_ids[slot] = bullet_id
+        
+        position = bullet_data['position']
+        if 'velocity' in bullet_data:
+            velocity = bullet_data['velocity']
+            vx, vy = velocity['x'], velocity['y']
+        else:
+            # Calculate velocity from direction and speed
+            direction = bullet_data.get('direction', {"x": 1.0, "y": 0.0})
+            speed = bullet_data.get('speed', BULLET_SPEED)
+            vx, vy = direction['x'] * speed, direction['y'] * speed
+        
+        self.pos_x[slot] = position['x']
+        self.pos_y[slot] = position['y']
+        self.vel_x[slot] = vx
+        self.vel_y[slot] = vy
+        self.created_time[slot] = bullet_data.get('created_time', created_time)
+        self.active[slot] = True
+    
+    def _free(self, slot: int):
+        self.active[slot] = False
+        self.vel_x[slot] = 0.0
+        self.vel_y[slot] = 0.0
+        bullet_id = self.slot_ids[slot]
+        self.slot_ids[slot] = None
+        del self.index[bullet_id]
+        self.free_slots.append(slot)
+    
+    def remove(self, bullet_id: str) -> bool:
+        """Remove bullet, return whether it existed"""
+        slot = self.index.get(bullet_id)
+        if slot is None:
+            return False
+        self._free(slot)
+        return True
+    
+    def clear(self):
+        """Remove all bullets"""
+        self.active[:] = False
+        self.index.clear()
+        self.slot_ids = [None] * self.capacity
+        self.free_slots = list(range(self.capacity - 1, -1, -1))
+    
+    def _integrate(self, dt: float, now: float) -> np.ndarray:
+        """Run the integration kernel over every slot, return the expired mask"""
+        return _integrate_bullets(
+            self.pos_x, self.pos_y, self.vel_x, self.vel_y, self.created_time, self.active,
+            float(dt), float(now), float(self.max_lifetime), SCREEN_WIDTH, SCREEN_HEIGHT
+        )
+    
+    def update(self, dt: float, now: float) -> int:
+        """Integrate all bullets and drop out-of-bounds/expired ones, return number removed
+        
+        now: wall-clock time, same clock as created_time
+        """
+        if not self.index:
+            return 0
+        
+        expired = self._integrate(dt, now)
+        removed = np.flatnonzero(expired)
+        if removed.size:
+            # Array side is freed in one masked write; only the id bookkeeping stays per-bullet
+            self.active[removed] = False
+            self.vel_x[removed] = 0.0
+            self.vel_y[removed] = 0.0
+            slot_ids = self.slot_ids
+            index = self.index
+            for slot in removed.tolist():
+                del index[slot_ids[slot]]
+                slot_ids[slot] = None
+            self.free_slots.extend(removed.tolist())
+        return len(removed)
+    
+    def positions(self, offset: int = 0) -> Iterator[Tuple[int, int]]:
+        """Integer (x, y) of active bullets - for rendering
+        
+        offset: subtracted from both axes, e.g. a sprite's half-size to get blit top-left corners
+        """
+        slots = np.flatnonzero(self.active)
+        xs = self.pos_x[slots].astype(np.int32)
+        ys = self.pos_y[slots].astype(np.int32)
+        if offset:
+            xs -= offset
+            ys -= offset
+        return zip(xs.tolist(), ys.tolist())
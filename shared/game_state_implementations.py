@@ -26,7 +26,7 @@ class MainMenuState(GameState):
         self.buttons = []
         self.title_font = None
         self.button_font = None
-        
+    
     def enter(self, previous_state=None, **kwargs):
         """Enter main menu"""
         if not self.initialized:
@@ -130,12 +130,12 @@ class MainMenuState(GameState):
         surface.fill((20, 20, 30))
         
         # Draw title
-        title_text = self.title_font.render("TANK WARS", True, (255, 255, 255))
+        title_text = self.render_text("TANK WARS", self.title_font, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 200))
         surface.blit(title_text, title_rect)
         
         # Draw subtitle
-        subtitle_text = self.button_font.render("Multiplayer Tank Battle", True, (200, 200, 200))
+        subtitle_text = self.render_text("Multiplayer Tank Battle", self.button_font, (200, 200, 200))
         subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, 250))
         surface.blit(subtitle_text, subtitle_rect)
         
@@ -157,7 +157,7 @@ class ServerBrowserState(GameState):
         self.back_button = None
         self.refresh_button = None
         self.status_text = "Click Refresh to scan for rooms"
-        
+    
     def enter(self, previous_state=None, **kwargs):
         """Enter server browser"""
         if not self.initialized:
@@ -307,11 +307,11 @@ class ServerBrowserState(GameState):
         surface.fill((25, 25, 35))
         
         # Title
-        title_text = self.title_font.render("Available Rooms", True, (255, 255, 255))
+        title_text = self.render_text("Available Rooms", self.title_font, (255, 255, 255))
         surface.blit(title_text, (50, 10))
         
         # Status text
-        status_surface = self.font.render(self.status_text, True, (200, 200, 200))
+        status_surface = self.render_text(self.status_text, self.font, (200, 200, 200))
         surface.blit(status_surface, (50, 110))
         
         # Buttons
@@ -325,7 +325,7 @@ class ServerBrowserState(GameState):
         # Scanning indicator
         if self.scanning:
             dots = "." * ((int(time.time() * 3) % 3) + 1)
-            scan_text = self.font.render(f"Scanning{dots}", True, (100, 255, 100))
+            scan_text = self.render_text(f"Scanning{dots}", self.font, (100, 255, 100))
             surface.blit(scan_text, (320, 50))
 
 
@@ -343,7 +343,7 @@ class RoomLobbyState(GameState):
         self.client = None  # Game client reference
         self.room_id = "default"
         self.room_name = "Game Room"
-        
+    
     def enter(self, previous_state=None, **kwargs):
         """Enter room lobby"""
         self.is_host = kwargs.get('is_host', False)
@@ -359,6 +359,10 @@ class RoomLobbyState(GameState):
         # Update button states
         self._update_button_states()
         
+        # New room - its frame_id counter starts over
+        if self.client:
+            self.client.latest_frame_id = -1
+        
         # If client is already connected, handle room logic directly
         if self.client and self.client.connected:
             if self.is_host:
@@ -610,25 +614,25 @@ class RoomLobbyState(GameState):
         surface.fill((30, 30, 40))
         
         # Title
-        title_text = self.title_font.render("Game Room", True, (255, 255, 255))
+        title_text = self.render_text("Game Room", self.title_font, (255, 255, 255))
         surface.blit(title_text, (50, 50))
         
         # Host indicator
         if self.is_host:
-            host_text = self.font.render("You are the host", True, (100, 255, 100))
+            host_text = self.render_text("You are the host", self.font, (100, 255, 100))
             surface.blit(host_text, (50, 90))
         
         # Room information
         player_count = sum(1 for slot in self.player_slots if slot.is_occupied)
-        info_text = self.font.render(f"Players: {player_count}/{MAX_PLAYERS_PER_ROOM} - Click empty slots to join", True, (200, 200, 200))
+        info_text = self.render_text(f"Players: {player_count}/{MAX_PLAYERS_PER_ROOM} - Click empty slots to join", self.font, (200, 200, 200))
         surface.blit(info_text, (50, 120))
         
         # Connection status
         if self.client:
             if self.client.connected:
-                status_text = self.font.render("Connected to server", True, (100, 255, 100))
+                status_text = self.render_text("Connected to server", self.font, (100, 255, 100))
             else:
-                status_text = self.font.render("Not connected", True, (255, 100, 100))
+                status_text = self.render_text("Not connected", self.font, (255, 100, 100))
             surface.blit(status_text, (50, 150))
         
         # Player slots
@@ -646,9 +650,20 @@ class InGameState(GameState):
     def __init__(self, state_manager):
         super().__init__(state_manager)
         self.client = None  # Game client reference
-        
+        self.big_font = None
+        self.font = None
+        self.small_font = None
+    
     def enter(self, previous_state=None, **kwargs):
         """Enter game"""
+        if not self.initialized:
+            # Create fonts once - the text cache is keyed by font identity
+            self.big_font = pygame.font.Font(None, 72)
+            self.font = pygame.font.Font(None, 36)
+            self.small_font = pygame.font.Font(None, 24)
+            self.victory_overlay = self._create_overlay((0, 50, 0))  # Dark green overlay
+            self.defeat_overlay = self._create_overlay((50, 0, 0))  # Dark red overlay
+            self.initialized = True
         print("🎮 Entered In-Game State")
         
         # Reset game result state
@@ -662,6 +677,13 @@ class InGameState(GameState):
             self.client.bullets.clear()
             print("🧹 Cleared bullets from previous game state")
     
+    def _create_overlay(self, color) -> pygame.Surface:
+        """Build a semi-transparent full-screen overlay in the display's pixel format"""
+        overlay = pygame.Surface((800, 600)).convert()
+        overlay.set_alpha(180)
+        overlay.fill(color)
+        return overlay
+    
     def exit(self, next_state=None):
         """Leave game"""
         print("🚪 Exiting game state")
@@ -733,35 +755,38 @@ class InGameState(GameState):
         if not self.client:
             # If no client, display error message
             surface.fill((50, 0, 0))
-            font = pygame.font.Font(None, 36)
-            text = font.render("Game Client Not Available", True, (255, 255, 255))
+            text = self.render_text("Game Client Not Available", self.font, (255, 255, 255))
             text_rect = text.get_rect(center=(400, 300))
             surface.blit(text, text_rect)
             return
         
-        # Clear screen
-        surface.fill((0, 0, 0))  # Black background
+        # Clear screen - the plain game view only clears what was drawn last frame
+        if self.client.connected and self.client.players and self.client.game_result is None:
+            self.client.begin_partial_frame()
+        else:
+            surface.fill((0, 0, 0))  # Black background
         
         if self.client.connected and self.client.players:
             # Render game world
             self.client.render_game_world()
         else:
             # Display connection status
-            font = pygame.font.Font(None, 36)
             if not self.client.connected:
-                text = font.render("Not connected to server", True, (255, 255, 100))
+                text = self.render_text("Not connected to server", self.font, (255, 255, 100))
             else:
-                text = font.render("Waiting for players...", True, (255, 255, 100))
+                text = self.render_text("Waiting for players...", self.font, (255, 255, 100))
             
             text_rect = text.get_rect(center=(400, 300))
             surface.blit(text, text_rect)
             
             # Display return hint
-            small_font = pygame.font.Font(None, 24)
-            hint_text = small_font.render("Press ESC to return to main menu", True, (200, 200, 200))
+            hint_text = self.render_text("Press ESC to return to main menu", self.small_font, (200, 200, 200))
             hint_rect = hint_text.get_rect(center=(400, 350))
             surface.blit(hint_text, hint_rect)
         
+        # HUD (status, ping, FPS, controls) - below the end-of-game banners
+        self.client.render_in_game_ui()
+        
         # Render victory/defeat banners if game has ended
         if self.client.game_result == "victory":
             self._render_victory_banner(surface)
@@ -771,65 +796,53 @@ class InGameState(GameState):
     def _render_victory_banner(self, surface: pygame.Surface):
         """Render victory banner"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((800, 600))
-        overlay.set_alpha(180)
-        overlay.fill((0, 50, 0))  # Dark green overlay
-        surface.blit(overlay, (0, 0))
+        surface.blit(self.victory_overlay, (0, 0))
         
         # Victory text
-        big_font = pygame.font.Font(None, 72)
-        victory_text = big_font.render("YOU WIN!", True, (0, 255, 0))
+        victory_text = self.render_text("YOU WIN!", self.big_font, (0, 255, 0))
         victory_rect = victory_text.get_rect(center=(400, 250))
         surface.blit(victory_text, victory_rect)
         
         # Game details
         if self.client.game_result_data:
             data = self.client.game_result_data
-            medium_font = pygame.font.Font(None, 36)
             
-            duration_text = medium_font.render(f"Game Duration: {data.game_duration:.1f}s", True, (200, 255, 200))
+            duration_text = self.render_text(f"Game Duration: {data.game_duration:.1f}s", self.font, (200, 255, 200))
             duration_rect = duration_text.get_rect(center=(400, 320))
             surface.blit(duration_text, duration_rect)
             
-            players_text = medium_font.render(f"Total Players: {data.total_players}", True, (200, 255, 200))
+            players_text = self.render_text(f"Total Players: {data.total_players}", self.font, (200, 255, 200))
             players_rect = players_text.get_rect(center=(400, 360))
             surface.blit(players_text, players_rect)
         
         # Exit instruction
-        small_font = pygame.font.Font(None, 24)
-        exit_text = small_font.render("Press any key to return to main menu", True, (255, 255, 255))
+        exit_text = self.render_text("Press any key to return to main menu", self.small_font, (255, 255, 255))
         exit_rect = exit_text.get_rect(center=(400, 450))
         surface.blit(exit_text, exit_rect)
     
     def _render_defeat_banner(self, surface: pygame.Surface):
         """Render defeat banner"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((800, 600))
-        overlay.set_alpha(180)
-        overlay.fill((50, 0, 0))  # Dark red overlay
-        surface.blit(overlay, (0, 0))
+        surface.blit(self.defeat_overlay, (0, 0))
         
         # Defeat text
-        big_font = pygame.font.Font(None, 72)
-        defeat_text = big_font.render("YOU LOSE", True, (255, 0, 0))
+        defeat_text = self.render_text("YOU LOSE", self.big_font, (255, 0, 0))
         defeat_rect = defeat_text.get_rect(center=(400, 250))
         surface.blit(defeat_text, defeat_rect)
         
         # Game details
         if self.client.game_result_data:
             data = self.client.game_result_data
-            medium_font = pygame.font.Font(None, 36)
             
-            killer_text = medium_font.render(f"Eliminated by: {data.killer_name}", True, (255, 200, 200))
+            killer_text = self.render_text(f"Eliminated by: {data.killer_name}", self.font, (255, 200, 200))
             killer_rect = killer_text.get_rect(center=(400, 320))
             surface.blit(killer_text, killer_rect)
             
-            survival_text = medium_font.render(f"Survival Time: {data.survival_time:.1f}s", True, (255, 200, 200))
+            survival_text = self.render_text(f"Survival Time: {data.survival_time:.1f}s", self.font, (255, 200, 200))
             survival_rect = survival_text.get_rect(center=(400, 360))
             surface.blit(survival_text, survival_rect)
         
         # Exit instruction
-        small_font = pygame.font.Font(None, 24)
-        exit_text = small_font.render("Press any key to return to main menu", True, (255, 255, 255))
+        exit_text = self.render_text("Press any key to return to main menu", self.small_font, (255, 255, 255))
         exit_rect = exit_text.get_rect(center=(400, 450))
         surface.blit(exit_text, exit_rect) 
\ No newline at end of file
@@ -51,6 +51,13 @@ class GameState(ABC):
     def render(self, surface: pygame.Surface):
         """渲染状态"""
         pass
+    
+    def render_text(self, text: str, font: pygame.font.Font, color) -> pygame.Surface:
+        """渲染文字，有客户端时复用其文字表面缓存"""
+        client = getattr(self.state_manager, 'client_ref', None)
+        if client is not None:
+            return client.render_text(text, font, color)
+        return font.render(text, True, color)
 
 
 class GameStateManager:
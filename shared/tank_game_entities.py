@@ -6,15 +6,24 @@ Contains Player and Bullet class definitions for shared use between server and c
 Ensures consistency of data structures between frontend and backend
 """
 
+import logging
+import math
 import time
 import os
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from websockets.server import WebSocketServerProtocol
 from dotenv import load_dotenv
 
+from tank_game_messages import (
+    BulletDestroyedMessage, CollisionMessage, PlayerDeathMessage,
+    GameDefeatMessage, GameVictoryMessage, GameStateUpdateMessage
+)
+
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+log = logging.getLogger(__name__)
+
 # Game configuration
 SCREEN_WIDTH = int(os.getenv('SCREEN_WIDTH', 800))
 SCREEN_HEIGHT = int(os.getenv('SCREEN_HEIGHT', 600))
@@ -23,11 +32,42 @@ BULLET_SPEED = int(os.getenv('BULLET_SPEED', 300))
 BULLET_DAMAGE = int(os.getenv('BULLET_DAMAGE', 25))
 BULLET_LIFETIME = float(os.getenv('BULLET_LIFETIME', 5.0))
 MAX_PLAYERS_PER_ROOM = int(os.getenv('MAX_PLAYERS_PER_ROOM', 8))
+BULLET_HIT_RADIUS = 25  # Bullet-to-tank-centre collision distance
+
+
+def apply_movement(position: Dict[str, float], directions: Dict[str, bool], dt: float):
+    """Advance position in place by one movement step - shared by client prediction and server"""
+    speed = TANK_SPEED
+    vx = vy = 0.0
+    
+    # Calculate velocity based on key states (same order of operations as before - bit-exact)
+    if directions["w"]:
+        vy -= speed
+    if directions["s"]:
+        vy += speed
+    if directions["a"]:
+        vx -= speed
+    if directions["d"]:
+        vx += speed
+    
+    # Update position + boundary check
+    position["x"] = max(0, min(SCREEN_WIDTH, position["x"] + vx * dt))
+    position["y"] = max(0, min(SCREEN_HEIGHT, position["y"] + vy * dt))
 
 
 class Player:
     """Player state class - shared between server and client"""
     
+    # Server-only / client-only fields stay unset on the other side, so hasattr() checks still work
+    __slots__ = (
+        'player_id', 'name', 'health', 'max_health', 'is_alive', 'is_local_player', 'slot_index',
+        'position', 'velocity', 'rotation', 'moving_directions', 'last_update',
+        'websocket', 'last_client_update', 'last_movement_broadcast', 'key_state_history',
+        'last_server_sync', 'base_position', 'base_timestamp', 'display_position',
+        'smooth_enabled', 'correction_threshold', 'interpolation_speed', 'interpolation_window',
+        '_snap_prev', '_snap_curr', '_snap_time',
+    )
+    
     def __init__(self, player_data: Dict, websocket = None):
         self.player_id = player_data['player_id']
         self.name = player_data['name']
@@ -35,6 +75,7 @@ class Player:
         self.max_health = player_data.get('max_health', 100)
         self.is_alive = player_data.get('is_alive', True)
         self.slot_index = player_data.get('slot_index', 0)  # Player slot index
+        self.is_local_player = False  # Set by callers that own this player locally
         
         # Position and movement
         self.position = player_data.get('position', {"x": SCREEN_WIDTH/2, "y": SCREEN_HEIGHT/2}).copy()
@@ -65,6 +106,12 @@ class Player:
             self.smooth_enabled = True
             self.correction_threshold = 10.0  # 位置校正阈值
             self.interpolation_speed = 15.0  # 插值速度
+            self.interpolation_window = 0.1  # 校正插值窗口（秒）
+            
+            # 快照插值：校正前/校正后的位置与校正时间（monotonic）
+            self._snap_prev: Optional[Dict[str, float]] = None
+            self._snap_curr: Optional[Dict[str, float]] = None
+            self._snap_time = 0.0
             
             # 初始化
             self.base_position = self.position.copy()
@@ -74,29 +121,34 @@ class Player:
         """基于按键事件更新位置 - 确定性同步"""
         current_time = time.time()
         
-        # 更新按键状态
-        self.moving_directions = key_states.copy()
+        # 更新按键状态（消息解析出的字典是新对象，且只会被整体替换，无需复制）
+        self.moving_directions = key_states
         
         # 如果有服务器位置，进行校正
         if server_position:
             dx = server_position["x"] - self.display_position["x"]
             dy = server_position["y"] - self.display_position["y"]
-            distance = (dx * dx + dy * dy) ** 0.5
+            distance_sq = dx * dx + dy * dy
             
-            if distance > self.correction_threshold:
+            if distance_sq > self.correction_threshold * self.correction_threshold:
+                # 记录校正前快照，渲染时在两者之间插值
+                self._snap_prev = self.display_position.copy()
+                self._snap_curr = server_position
+                self._snap_time = time.monotonic()
+                
                 # 校正基准位置和时间
                 self.base_position = server_position.copy()
                 self.base_timestamp = server_timestamp
                 self.display_position = server_position.copy()
                 self.position = self.display_position.copy()
-                print(f"🔧 Key event correction: {distance:.1f}px")
+                log.debug("🔧 Key event correction: %.1fpx", distance_sq ** 0.5)
             else:
                 # 小幅校正，设置新的基准点
                 self.base_position = self.display_position.copy()
                 self.base_timestamp = current_time
         
         # 记录按键事件（用于状态重放）
-        self.key_state_history.append((server_timestamp, key_states.copy()))
+        self.key_state_history.append((server_timestamp, key_states))
         
         # 清理旧的历史记录（保留最近1秒）
         cutoff_time = current_time - 1.0
@@ -105,28 +157,64 @@ class Player:
             if ts > cutoff_time
         ]
     
-    def update_deterministic_position(self, dt: float):
-        """确定性位置更新 - 基于按键状态历史"""
-        current_time = time.time()
+    def update_deterministic_position(self, dt: float, now: Optional[float] = None):
+        """确定性位置更新 - 基于按键状态历史
+        
+        now: 本帧的 time.time() 时间戳，未提供时自行读取
+        """
+        display_position = self.display_position
         
         # 使用增量移动而不是累积计算
-        if any(self.moving_directions.values()):
-            velocity = self._calculate_velocity_from_directions(self.moving_directions)
-            
-            # 直接使用dt进行增量移动（TANK_SPEED = 300像素/秒）
-            self.display_position["x"] += velocity["x"] * dt
-            self.display_position["y"] += velocity["y"] * dt
+        directions = self.moving_directions
+        if any(directions.values()):
+            # 速度计算与 _calculate_velocity_from_directions 相同，但用局部变量代替每帧新建的字典
+            vx = vy = 0.0
+            if directions.get("w", False):
+                vy -= TANK_SPEED
+            if directions.get("s", False):
+                vy += TANK_SPEED
+            if directions.get("a", False):
+                vx -= TANK_SPEED
+            if directions.get("d", False):
+                vx += TANK_SPEED
             
-            # 边界检查
-            self.display_position["x"] = max(0, min(SCREEN_WIDTH, self.display_position["x"]))
-            self.display_position["y"] = max(0, min(SCREEN_HEIGHT, self.display_position["y"]))
+            # 直接使用dt进行增量移动（TANK_SPEED = 300像素/秒）+ 边界检查
+            x = max(0, min(SCREEN_WIDTH, display_position["x"] + vx * dt))
+            y = max(0, min(SCREEN_HEIGHT, display_position["y"] + vy * dt))
+            display_position["x"] = x
+            display_position["y"] = y
             
-            # 更新基准位置和时间戳（避免累积误差）
-            self.base_position = self.display_position.copy()
-            self.base_timestamp = current_time
+            # 更新基准位置和时间戳（避免累积误差）- 原地写入，避免每帧分配字典
+            self.base_position["x"] = x
+            self.base_position["y"] = y
+            self.base_timestamp = now if now is not None else time.time()
         
         # 更新实际位置
-        self.position = self.display_position.copy()
+        self.position["x"] = display_position["x"]
+        self.position["y"] = display_position["y"]
+    
+    def render_position(self, now: float) -> Tuple[float, float]:
+        """渲染位置 (x, y) - 在校正前快照与当前权威位置之间线性插值
+        
+        now: time.monotonic() 时间戳
+        """
+        target = self.display_position
+        if self._snap_prev is None:
+            return target["x"], target["y"]
+        
+        alpha = (now - self._snap_time) / self.interpolation_window
+        if alpha >= 1.0:
+            self._snap_prev = None
+            return target["x"], target["y"]
+        if alpha < 0.0:
+            alpha = 0.0
+        
+        # 插值偏移随时间衰减，叠加在仍在移动的当前位置上
+        remaining = 1.0 - alpha
+        prev = self._snap_prev
+        curr = self._snap_curr
+        return (target["x"] + (prev["x"] - curr["x"]) * remaining,
+                target["y"] + (prev["y"] - curr["y"]) * remaining)
     
     def _calculate_velocity_from_directions(self, directions: Dict[str, bool]) -> Dict[str, float]:
         """基于移动方向计算速度向量"""
@@ -148,47 +236,24 @@ class Player:
         """平滑移动到目标位置"""
         dx = target_position["x"] - self.display_position["x"]
         dy = target_position["y"] - self.display_position["y"]
-        distance = (dx * dx + dy * dy) ** 0.5
+        distance = math.hypot(dx, dy)
         
         if distance < 0.5:
             # 距离很小，直接到达
             self.display_position = target_position.copy()
         else:
-            # 平滑插值
+            # 平滑插值 - 按移动比例缩放，一次除法
             move_distance = self.interpolation_speed * distance * dt
             if move_distance > distance:
                 move_distance = distance
             
-            if distance > 0:
-                move_x = (dx / distance) * move_distance
-                move_y = (dy / distance) * move_distance
-                
-                self.display_position["x"] += move_x
-                self.display_position["y"] += move_y
+            scale = move_distance / distance
+            self.display_position["x"] += dx * scale
+            self.display_position["y"] += dy * scale
 
     def update_position(self, dt: float):
         """Update position - exactly same algorithm as server"""
-        speed = TANK_SPEED
-        velocity = {"x": 0.0, "y": 0.0}
-        
-        # Calculate velocity based on key states
-        if self.moving_directions["w"]:
-            velocity["y"] -= speed
-        if self.moving_directions["s"]:
-            velocity["y"] += speed
-        if self.moving_directions["a"]:
-            velocity["x"] -= speed
-        if self.moving_directions["d"]:
-            velocity["x"] += speed
-        
-        # Update position
-        self.position["x"] += velocity["x"] * dt
-        self.position["y"] += velocity["y"] * dt
-        
-        # Boundary check
-        self.position["x"] = max(0, min(SCREEN_WIDTH, self.position["x"]))
-        self.position["y"] = max(0, min(SCREEN_HEIGHT, self.position["y"]))
-        
+        apply_movement(self.position, self.moving_directions, dt)
         self.last_update = time.time()
 
     # 移除旧的复杂校正方法，替换为确定性方法
@@ -225,6 +290,8 @@ class Player:
 class Bullet:
     """Bullet state class - shared between server and client"""
     
+    __slots__ = ('bullet_id', 'owner_id', 'position', 'velocity', 'damage', 'created_time', 'max_lifetime')
+    
     def __init__(self, bullet_data: Dict):
         self.bullet_id = bullet_data['bullet_id']
         self.owner_id = bullet_data['owner_id']
@@ -243,18 +310,23 @@ class Bullet:
         self.created_time = bullet_data.get('created_time', time.time())
         self.max_lifetime = BULLET_LIFETIME
     
-    def update(self, dt: float) -> bool:
-        """Update bullet position, return whether still valid"""
-        self.position["x"] += self.velocity["x"] * dt
-        self.position["y"] += self.velocity["y"] * dt
+    def update(self, dt: float, now: Optional[float] = None) -> bool:
+        """Update bullet position, return whether still valid
+        
+        now: wall-clock time shared by all bullets of a tick, read here if not given
+        """
+        position = self.position
+        velocity = self.velocity
+        x = position["x"] + velocity["x"] * dt
+        y = position["y"] + velocity["y"] * dt
+        position["x"] = x
+        position["y"] = y
         
         # Check boundaries and lifetime
-        if (self.position["x"] < 0 or self.position["x"] > SCREEN_WIDTH or
-            self.position["y"] < 0 or self.position["y"] > SCREEN_HEIGHT or
-            time.time() - self.created_time > self.max_lifetime):
-            return False
-        
-        return True
+        if now is None:
+            now = time.time()
+        return (0 <= x <= SCREEN_WIDTH and 0 <= y <= SCREEN_HEIGHT and
+                now - self.created_time <= self.max_lifetime)
     
     def to_dict(self) -> Dict:
         """Convert to dictionary - for network transmission"""
@@ -496,11 +568,11 @@ class GameRoom:
         
         # Update bullet positions
         bullets_to_remove = []
+        now = time.time()
         for bullet_id, bullet in self.bullets.items():
-            if not bullet.update(dt):
+            if not bullet.update(dt, now):
                 bullets_to_remove.append(bullet_id)
                 # Create bullet destruction event
-                from tank_game_messages import BulletDestroyedMessage
                 bullet_destroyed_event = BulletDestroyedMessage(
                     bullet_id=bullet_id,
                     reason="expired"
@@ -526,22 +598,25 @@ class GameRoom:
         events = []
         bullets_to_remove = []
         
+        hit_radius_sq = BULLET_HIT_RADIUS * BULLET_HIT_RADIUS
+        
         for bullet_id, bullet in self.bullets.items():
+            bx = bullet.position['x']
+            by = bullet.position['y']
+            owner_id = bullet.owner_id
             for player_id, player in self.players.items():
                 # Skip bullet owner
-                if bullet.owner_id == player_id or not player.is_alive:
+                if owner_id == player_id or not player.is_alive:
                     continue
                 
-                # Simple collision detection (circular collision)
-                dx = bullet.position['x'] - player.position['x']
-                dy = bullet.position['y'] - player.position['y']
-                distance = (dx * dx + dy * dy) ** 0.5
+                # Simple collision detection (circular collision, squared distance - no sqrt)
+                dx = bx - player.position['x']
+                dy = by - player.position['y']
                 
-                if distance < 25:  # Collision radius
+                if dx * dx + dy * dy < hit_radius_sq:  # Collision radius
                     # Create collision event
                     player.health -= bullet.damage
                     
-                    from tank_game_messages import CollisionMessage
                     collision_event = CollisionMessage(
                         bullet_id=bullet_id,
                         target_player_id=player_id,
@@ -557,7 +632,6 @@ class GameRoom:
                     # Check if player died
                     if player.health <= 0:
                         player.is_alive = False
-                        from tank_game_messages import PlayerDeathMessage
                         death_event = PlayerDeathMessage(
                             player_id=player_id,
                             killer_id=bullet.owner_id,
@@ -576,7 +650,6 @@ class GameRoom:
             if bullet_id in self.bullets:
                 del self.bullets[bullet_id]
                 # Create bullet destruction event
-                from tank_game_messages import BulletDestroyedMessage
                 bullet_destroyed_event = BulletDestroyedMessage(
                     bullet_id=bullet_id,
                     reason="collision"
@@ -600,7 +673,6 @@ class GameRoom:
             current_time = time.time()
             survival_time = current_time - self.game_start_time if self.game_start_time else 0.0
             
-            from tank_game_messages import GameDefeatMessage
             defeat_event = GameDefeatMessage(
                 eliminated_player_id=eliminated_player_id,
                 eliminated_player_name=eliminated_player.name,
@@ -618,7 +690,6 @@ class GameRoom:
             current_time = time.time()
             game_duration = current_time - self.game_start_time if self.game_start_time else 0.0
             
-            from tank_game_messages import GameVictoryMessage
             victory_event = GameVictoryMessage(
                 winner_player_id=winner.player_id,
                 winner_player_name=winner.name,
@@ -648,7 +719,6 @@ class GameRoom:
         # 对于等待中的房间，只在状态真正改变时返回
         if self.room_state == "playing":
             # 游戏进行中，定期同步所有玩家位置确保一致性
-            from tank_game_messages import GameStateUpdateMessage
             return GameStateUpdateMessage(
                 players=[player.to_dict() for player in self.players.values()],
                 bullets=[bullet.to_dict() for bullet in self.bullets.values()],
@@ -659,7 +729,6 @@ class GameRoom:
             # 等待状态，只在状态变更时同步
             self.state_changed = False
             
-            from tank_game_messages import GameStateUpdateMessage
             return GameStateUpdateMessage(
                 players=[player.to_dict() for player in self.players.values()],
                 bullets=[bullet.to_dict() for bullet in self.bullets.values()],
@@ -6,6 +6,7 @@ All frontend-backend interactions are done through standardized WebSocket messag
 ensuring type safety and extensibility.
 """
 
+import struct
 import time
 from abc import ABC, abstractmethod
 from dataclasses import asdict, dataclass, field
@@ -13,6 +14,47 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 import json
 
+# Fast JSON codec (optional) - falls back to stdlib json when orjson isn't installed
+# WebSocket game frames stay text (str) - binary frames are reserved for the msgpack subprotocol
+try:
+    import orjson
+    
+    def json_dumps(data: Any) -> str:
+        return orjson.dumps(data).decode()
+    
+    json_dumpb = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    
+    def json_dumpb(data: Any) -> bytes:
+        return json.dumps(data).encode()
+    
+    json_loads = json.loads
+
+# Binary MessagePack codec (optional) - negotiated via WebSocket subprotocol
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SUBPROTOCOL_MSGPACK = "msgpack"
+SUBPROTOCOL_JSON = "json"
+# Offered/accepted subprotocols in preference order
+SUPPORTED_SUBPROTOCOLS = [SUBPROTOCOL_MSGPACK, SUBPROTOCOL_JSON] if msgpack else [SUBPROTOCOL_JSON]
+
+# Packed key event - client -> server only, on the msgpack subprotocol. Layout: tag, key bits
+# (w/a/s/d = bits 0-3), sequence, timestamp, x, y = 30 bytes; the server knows the sender, so
+# the player id is left out. The tag is a msgpack positive fixint, which never starts a message map.
+KEY_STATE_FRAME_TAG = 0x01
+_KEY_STATE_FRAME = struct.Struct('<BBIddd')
+_KEY_STATE_KEYS = ('w', 'a', 's', 'd')
+
+# LAN discovery - a client broadcasts the query as one UDP datagram to the game port number,
+# every server on the segment answers with the reply; the replies' source addresses are the servers
+DISCOVERY_QUERY = b"TANK_DISCOVER"
+DISCOVERY_REPLY = b"TANK_SERVER"
+
 
 class GameMessageType(str, Enum):
     """All possible game message types"""
@@ -59,6 +101,7 @@ class GameMessageType(str, Enum):
     PONG = "pong"
     ERROR = "error"
     DEBUG = "debug"
+    BATCH = "batch"  # Envelope carrying several messages in one frame
     
     # 新增：按键事件消息
     KEY_STATE_CHANGE = "key_state_change"
@@ -86,8 +129,26 @@ class BaseGameMessage(ABC):
         return data
     
     def to_json(self) -> str:
-        """Convert to JSON string"""
-        return json.dumps(self.to_dict())
+        """Convert to JSON string - cached per instance, so broadcasting one message serializes once"""
+        cached = self.__dict__.get("_cached_json")
+        if cached is None:
+            cached = json_dumps(self.to_dict())
+            self._cached_json = cached
+        return cached
+    
+    def to_bytes(self) -> bytes:
+        """Convert to MessagePack bytes - cached per instance like to_json"""
+        cached = self.__dict__.get("_cached_bytes")
+        if cached is None:
+            cached = msgpack.packb(self.to_dict(), use_bin_type=True)
+            self._cached_bytes = cached
+        return cached
+    
+    def encode(self, subprotocol: Optional[str] = None) -> Union[str, bytes]:
+        """Encode for the negotiated WebSocket subprotocol - binary frame for msgpack, text frame otherwise"""
+        if subprotocol == SUBPROTOCOL_MSGPACK:
+            return self.to_bytes()
+        return self.to_json()
 
 
 # ===============================
@@ -614,16 +675,43 @@ class KeyStateChangeMessage(BaseGameMessage):
     key_states: Dict[str, bool]  # {"w": True, "a": False, "s": False, "d": False}
     timestamp: Optional[float] = None
     position: Optional[Dict[str, float]] = None  # 当前位置（用于校正）
+    sequence: Optional[int] = None  # 客户端输入序号（服务器回传用于预测对账）
     
-    def __init__(self, player_id: str, key_states: Dict[str, bool], timestamp: float = None, position: Dict[str, float] = None):
+    def __init__(self, player_id: str, key_states: Dict[str, bool], timestamp: float = None, position: Dict[str, float] = None,
+                 sequence: int = None):
         self.player_id = player_id
         self.key_states = key_states
         self.timestamp = timestamp or time.time()
         self.position = position or {"x": 0.0, "y": 0.0}
+        self.sequence = sequence
     
     @property
     def type(self) -> GameMessageType:
         return GameMessageType.KEY_STATE_CHANGE
+    
+    def to_packed(self) -> bytes:
+        """Encode as a fixed-layout binary frame (see KEY_STATE_FRAME_TAG)"""
+        key_states = self.key_states
+        key_bits = 0
+        for i, key in enumerate(_KEY_STATE_KEYS):
+            if key_states.get(key):
+                key_bits |= 1 << i
+        position = self.position
+        return _KEY_STATE_FRAME.pack(KEY_STATE_FRAME_TAG, key_bits, self.sequence or 0,
+                                     self.timestamp, position["x"], position["y"])
+    
+    @staticmethod
+    def unpack(data: bytes) -> Dict[str, Any]:
+        """Decode a packed frame into the same dict shape as a msgpack/JSON frame"""
+        _, key_bits, sequence, timestamp, x, y = _KEY_STATE_FRAME.unpack(data)
+        return {
+            "type": GameMessageType.KEY_STATE_CHANGE.value,
+            "player_id": "",  # filled in by the server from the connection
+            "key_states": {key: bool(key_bits & (1 << i)) for i, key in enumerate(_KEY_STATE_KEYS)},
+            "timestamp": timestamp,
+            "position": {"x": x, "y": y},
+            "sequence": sequence or None,
+        }
 
 
 # ===============================
@@ -667,13 +755,22 @@ MESSAGE_TYPE_MAP = {
 }
 
 
+def _decode_frame(message_data: Union[str, bytes, Dict[str, Any]]) -> Dict[str, Any]:
+    """Decode a raw WebSocket frame into a dict"""
+    if isinstance(message_data, bytes):
+        # Binary frames only arrive on the msgpack subprotocol
+        if message_data[0] == KEY_STATE_FRAME_TAG:
+            return KeyStateChangeMessage.unpack(message_data)
+        return msgpack.unpackb(message_data, raw=False)
+    if isinstance(message_data, str):
+        return json_loads(message_data)
+    return message_data
+
+
 def parse_message(message_data: Union[str, Dict[str, Any]]) -> Optional[BaseGameMessage]:
     """Parse message data to message object"""
     try:
-        if isinstance(message_data, str):
-            data = json.loads(message_data)
-        else:
-            data = message_data
+        data = _decode_frame(message_data)
         
         message_type = GameMessageType(data.get("type"))
         message_class = MESSAGE_TYPE_MAP.get(message_type)
@@ -692,6 +789,44 @@ def parse_message(message_data: Union[str, Dict[str, Any]]) -> Optional[BaseGame
         return None
 
 
+def parse_messages(message_data: Union[str, bytes]) -> List[BaseGameMessage]:
+    """Parse a frame that may be a batch envelope - returns its messages in send order"""
+    try:
+        data = _decode_frame(message_data)
+    except Exception as e:
+        print(f"Error parsing message: {e}")
+        return []
+    if not isinstance(data, dict):
+        # e.g. an unknown binary tag that happens to be a valid msgpack scalar
+        print(f"Error parsing message: expected an object, got {type(data).__name__}")
+        return []
+    
+    if data.get("type") == GameMessageType.BATCH.value:
+        messages = (parse_message(item) for item in data.get("messages", ()))
+        return [message for message in messages if message]
+    
+    message = parse_message(data)
+    return [message] if message else []
+
+
+def encode_batch(messages: List[BaseGameMessage], subprotocol: Optional[str] = None) -> Union[str, bytes]:
+    """Encode messages into one frame - a single message is sent as-is, several in a batch envelope"""
+    if len(messages) == 1:
+        return messages[0].encode(subprotocol)
+    
+    envelope = {"type": GameMessageType.BATCH.value, "messages": [message.to_dict() for message in messages]}
+    if subprotocol == SUBPROTOCOL_MSGPACK:
+        return msgpack.packb(envelope, use_bin_type=True)
+    return json_dumps(envelope)
+
+
+def encode_client_frame(messages: List[BaseGameMessage], subprotocol: Optional[str] = None) -> Union[str, bytes]:
+    """encode_batch for client -> server frames - a lone key event goes out packed on the msgpack subprotocol"""
+    if subprotocol == SUBPROTOCOL_MSGPACK and len(messages) == 1 and isinstance(messages[0], KeyStateChangeMessage):
+        return messages[0].to_packed()
+    return encode_batch(messages, subprotocol)
+
+
 def create_error_message(error_code: str, error_message: str, details: Optional[Dict] = None) -> ErrorMessage:
     """Convenience function to create error message"""
     return ErrorMessage(
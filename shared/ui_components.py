@@ -18,6 +18,25 @@ class ButtonState(Enum):
     DISABLED = "disabled"
 
 
+class CachedText:
+    """文字表面缓存 - 只在文本、颜色或字体变化时重新渲染"""
+    
+    def __init__(self):
+        self._key = None
+        self._surface: Optional[pygame.Surface] = None
+        # 复用的位置矩形，尺寸随表面更新，调用方只需改它的位置
+        self.rect = pygame.Rect(0, 0, 0, 0)
+    
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """返回渲染好的文字表面，与上次相同则直接复用"""
+        key = (text, color, id(font))
+        if key != self._key:
+            self._key = key
+            self._surface = font.render(text, True, color)
+            self.rect.size = self._surface.get_size()
+        return self._surface
+
+
 class Button:
     """游戏按钮类"""
     
@@ -29,6 +48,7 @@ class Button:
         self.on_click = on_click
         self.state = ButtonState.NORMAL
         self.enabled = True
+        self.label = CachedText()
         
         # 颜色配置
         self.colors = {
@@ -100,9 +120,9 @@ class Button:
         pygame.draw.rect(surface, colors['border'], self.rect, 2)
         
         # 绘制文本
-        text_surface = self.font.render(self.text, True, colors['text'])
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+        text_surface = self.label.render(self.font, self.text, colors['text'])
+        self.label.rect.center = self.rect.center
+        surface.blit(text_surface, self.label.rect)
     
     def set_enabled(self, enabled: bool):
         """设置按钮是否可用"""
@@ -123,6 +143,7 @@ class PlayerSlot:
         self.player_data: Optional[Dict[str, Any]] = None
         self.is_occupied = False
         self.is_local_player = False
+        self.label = CachedText()
         
         # 颜色配置
         self.colors = {
@@ -198,9 +219,9 @@ class PlayerSlot:
         else:
             text = f"Slot {self.slot_id + 1}"
         
-        text_surface = self.font.render(text, True, colors['text'])
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+        text_surface = self.label.render(self.font, text, colors['text'])
+        self.label.rect.center = self.rect.center
+        surface.blit(text_surface, self.label.rect)
 
 
 class Panel:
@@ -212,6 +233,7 @@ class Panel:
         self.title = title
         self.font = font
         self.children = []
+        self.title_label = CachedText()
         
         # 颜色配置
         self.bg_color = (40, 40, 40)
@@ -240,8 +262,8 @@ class Panel:
         
         # 绘制标题
         if self.title and self.font:
-            title_surface = self.font.render(self.title, True, self.title_color)
-            title_rect = title_surface.get_rect()
+            title_surface = self.title_label.render(self.font, self.title, self.title_color)
+            title_rect = self.title_label.rect
             title_rect.centerx = self.rect.centerx
             title_rect.y = self.rect.y + 10
             surface.blit(title_surface, title_rect)
@@ -263,6 +285,7 @@ class TextLabel:
         self.font = font
         self.color = color
         self.centered = centered
+        self.label = CachedText()
     
     def set_text(self, text: str):
         """设置文本"""
@@ -270,9 +293,9 @@ class TextLabel:
     
     def draw(self, surface: pygame.Surface):
         """绘制文本标签"""
-        text_surface = self.font.render(self.text, True, self.color)
+        text_surface = self.label.render(self.font, self.text, self.color)
         if self.centered:
-            text_rect = text_surface.get_rect(center=(self.x, self.y))
-            surface.blit(text_surface, text_rect)
+            self.label.rect.center = (self.x, self.y)
+            surface.blit(text_surface, self.label.rect)
         else:
             surface.blit(text_surface, (self.x, self.y)) 
\ No newline at end of file
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+子弹池测试脚本
+验证 BulletPool 的槽位管理（删除、扩容、复用）、寿命/边界剔除，以及 numba 与 numpy 实现的一致性
+"""
+
+import importlib.util
+import os
+import random
+import sys
+
+# Add shared directory to Python path
+SHARED_DIR = os.path.join(os.path.dirname(__file__), 'shared')
+sys.path.append(SHARED_DIR)
+
+import numpy as np
+
+import bullet_pool
+from bullet_pool import BulletPool
+from tank_game_entities import SCREEN_WIDTH, SCREEN_HEIGHT, BULLET_LIFETIME
+
+
+def load_numpy_only_pool_module():
+    """以屏蔽 numba 的方式重新加载 bullet_pool，得到纯 numpy 实现"""
+    missing = object()
+    saved = sys.modules.get('numba', missing)
+    sys.modules['numba'] = None  # import numba -> ImportError
+    try:
+        spec = importlib.util.spec_from_file_location(
+            'bullet_pool_numpy_only', os.path.join(SHARED_DIR, 'bullet_pool.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if saved is missing:
+            del sys.modules['numba']
+        else:
+            sys.modules['numba'] = saved
+    return module
+
+
+def bullet(bullet_id: str, x: float, y: float, vx: float = 0.0, vy: float = 0.0) -> dict:
+    """构造与 Bullet 相同格式的子弹数据"""
+    return {
+        'bullet_id': bullet_id,
+        'owner_id': 'owner',
+        'position': {"x": x, "y": y},
+        'velocity': {"x": vx, "y": vy},
+    }
+
+
+class BulletPoolTester:
+    """子弹池测试器"""
+
+    def check(self, condition: bool, message: str) -> bool:
+        """打印失败原因并返回检查结果"""
+        if not condition:
+            print(f"  ❌ {message}")
+        return condition
+
+    def check_consistency(self, pool: BulletPool) -> bool:
+        """索引、槽位 id 和空闲列表必须互相一致"""
+        ok = True
+        slots = list(pool.index.values())
+        ok &= self.check(len(slots) == len(set(slots)), "two bullets share a slot")
+        ok &= self.check(all(pool.slot_ids[slot] == bid for bid, slot in pool.index.items()),
+                         "slot_ids disagrees with index")
+        ok &= self.check(not set(slots) & set(pool.free_slots), "a used slot is also on the free list")
+        ok &= self.check(len(slots) + len(pool.free_slots) == pool.capacity, "slots leaked or duplicated")
+        ok &= self.check(int(pool.active.sum()) == len(pool), "active mask count != number of bullets")
+        return ok
+
+    def position_of(self, pool: BulletPool, bullet_id: str):
+        slot = pool.index[bullet_id]
+        return float(pool.pos_x[slot]), float(pool.pos_y[slot])
+
+    def test_remove_from_middle(self) -> bool:
+        """测试从中间删除：其余子弹的 id 和位置不变，空出的槽位被复用"""
+        print("🧪 Testing remove from middle...")
+        pool = BulletPool(capacity=8)
+        for i in range(5):
+            pool.spawn(bullet(f"b{i}", 100.0 + i * 10, 200.0 + i), created_time=0.0)
+
+        middle_slot = pool.index["b2"]
+        ok = self.check(pool.remove("b2"), "remove of existing bullet returned False")
+        ok &= self.check(not pool.remove("b2"), "second remove returned True")
+        ok &= self.check("b2" not in pool and len(pool) == 4, "b2 still present after remove")
+        ok &= self.check(set(pool.ids()) == {"b0", "b1", "b3", "b4"}, f"wrong ids: {sorted(pool.ids())}")
+        for i in (0, 1, 3, 4):
+            ok &= self.check(self.position_of(pool, f"b{i}") == (100.0 + i * 10, 200.0 + i),
+                             f"b{i} moved after removing b2")
+        ok &= self.check(len(list(pool.positions())) == 4, "positions() yields the removed bullet")
+        ok &= self.check_consistency(pool)
+
+        # 空出的槽位应被下一颗子弹复用，已有子弹不受影响
+        pool.spawn(bullet("b5", 50.0, 60.0), created_time=0.0)
+        ok &= self.check(pool.index["b5"] == middle_slot, "freed slot was not reused")
+        ok &= self.check(self.position_of(pool, "b5") == (50.0, 60.0), "reused slot has stale position")
+        ok &= self.check(self.position_of(pool, "b3") == (130.0, 203.0), "b3 changed when slot was reused")
+        ok &= self.check_consistency(pool)
+
+        # 重复 spawn 同一 id 覆盖原槽位而不是占用新槽位
+        pool.spawn(bullet("b5", 70.0, 80.0), created_time=0.0)
+        ok &= self.check(len(pool) == 5 and self.position_of(pool, "b5") == (70.0, 80.0),
+                         "respawning an existing id did not overwrite it")
+        ok &= self.check_consistency(pool)
+        return ok
+
+    def test_grow(self) -> bool:
+        """测试超过初始容量后扩容：所有子弹数据保留"""
+        print("🧪 Testing grow past initial capacity...")
+        pool = BulletPool(capacity=4)
+        for i in range(10):
+            pool.spawn(bullet(f"g{i}", float(i), float(i * 2), vx=float(i), vy=-float(i)), created_time=1.0)
+
+        ok = self.check(pool.capacity == 16, f"capacity {pool.capacity}, expected 16")
+        ok &= self.check(len(pool) == 10, f"len {len(pool)}, expected 10")
+        for name in ('pos_x', 'pos_y', 'vel_x', 'vel_y', 'created_time', 'active'):
+            ok &= self.check(getattr(pool, name).shape == (16,), f"{name} not resized")
+        for i in range(10):
+            slot = pool.index[f"g{i}"]
+            ok &= self.check(self.position_of(pool, f"g{i}") == (float(i), float(i * 2)),
+                             f"g{i} position lost on grow")
+            ok &= self.check((pool.vel_x[slot], pool.vel_y[slot]) == (float(i), -float(i)),
+                             f"g{i} velocity lost on grow")
+        ok &= self.check_consistency(pool)
+
+        # 扩容后删除再添加，仍然一致
+        pool.remove("g0")
+        pool.remove("g9")
+        pool.spawn(bullet("g10", 1.0, 1.0), created_time=1.0)
+        ok &= self.check(set(pool.ids()) == {f"g{i}" for i in range(1, 11)} - {"g9"} | {"g10"},
+                         f"wrong ids after grow + remove: {sorted(pool.ids())}")
+        ok &= self.check_consistency(pool)
+        return ok
+
+    def test_cull(self) -> bool:
+        """测试积分后按边界和寿命剔除"""
+        print("🧪 Testing lifetime/bounds cull...")
+        pool = BulletPool(capacity=8)
+        now = 100.0
+        dt = 0.1
+        pool.spawn(bullet("stay", 100.0, 100.0, vx=50.0, vy=20.0), created_time=now)
+        pool.spawn(bullet("right", SCREEN_WIDTH - 1.0, 100.0, vx=300.0), created_time=now)
+        pool.spawn(bullet("top", 100.0, 1.0, vy=-300.0), created_time=now)
+        pool.spawn(bullet("old", 200.0, 200.0), created_time=now - BULLET_LIFETIME - 0.01)
+        pool.spawn(bullet("young", 300.0, 300.0), created_time=now - BULLET_LIFETIME + 0.5)
+
+        removed = pool.update(dt, now)
+        ok = self.check(removed == 3, f"update removed {removed}, expected 3")
+        ok &= self.check(set(pool.ids()) == {"stay", "young"}, f"wrong survivors: {sorted(pool.ids())}")
+        x, y = self.position_of(pool, "stay")
+        ok &= self.check(abs(x - 105.0) < 1e-9 and abs(y - 102.0) < 1e-9, f"stay integrated to ({x}, {y})")
+        ok &= self.check(self.position_of(pool, "young") == (300.0, 300.0), "stationary bullet moved")
+        freed = [slot for slot in range(pool.capacity) if pool.slot_ids[slot] is None]
+        ok &= self.check(not pool.vel_x[freed].any() and not pool.vel_y[freed].any(),
+                         "culled slots keep their velocity")
+        ok &= self.check_consistency(pool)
+
+        # 剔除后的槽位可以复用
+        for i in range(3):
+            pool.spawn(bullet(f"n{i}", 10.0, 10.0), created_time=now)
+        ok &= self.check(pool.capacity == 8 and len(pool) == 5, "culled slots not reused")
+        ok &= self.check_consistency(pool)
+
+        # 空池更新不做任何事
+        ok &= self.check(BulletPool(capacity=2).update(dt, now) == 0, "empty pool update removed bullets")
+        return ok
+
+    def test_numba_numpy_parity(self) -> bool:
+        """测试 numba 内核与 numpy 回退实现结果一致"""
+        print("🧪 Testing numba vs numpy fallback parity...")
+        numpy_module = load_numpy_only_pool_module()
+        ok = self.check(numpy_module.njit is None, "numba was not blocked for the fallback module")
+        if bullet_pool.njit is None:
+            print("  ⚠️ numba not installed - comparing the numpy fallback with itself")
+
+        rng = random.Random(1234)
+        pools = (BulletPool(capacity=4), numpy_module.BulletPool(capacity=4))
+        now = 1000.0
+        next_id = 0
+        for step in range(200):
+            now += 1 / 60
+            # 每帧随机生成、删除子弹，两边执行完全相同的操作
+            for _ in range(rng.randint(0, 3)):
+                data = bullet(f"p{next_id}", rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+                              rng.uniform(-400, 400), rng.uniform(-400, 400))
+                created = now - rng.uniform(0, BULLET_LIFETIME * 1.2)
+                next_id += 1
+                for pool in pools:
+                    pool.spawn(data, created_time=created)
+            if pools[0].index and rng.random() < 0.2:
+                victim = rng.choice(sorted(pools[0].ids()))
+                for pool in pools:
+                    pool.remove(victim)
+
+            removed = [pool.update(1 / 60, now) for pool in pools]
+            if not self.check(removed[0] == removed[1], f"step {step}: removed {removed[0]} vs {removed[1]}"):
+                return False
+            a, b = pools
+            if not self.check(a.index == b.index, f"step {step}: bullet id -> slot maps differ"):
+                return False
+            slots = sorted(a.index.values())
+            for name in ('pos_x', 'pos_y'):
+                if not self.check(np.allclose(getattr(a, name)[slots], getattr(b, name)[slots], rtol=0, atol=1e-9),
+                                  f"step {step}: {name} differs"):
+                    return False
+
+        ok &= self.check(next_id > len(pools[0]) > 0, "scenario never culled or never kept bullets")
+        ok &= self.check_consistency(pools[0]) and self.check_consistency(pools[1])
+        return ok
+
+    def run_all_tests(self):
+        """运行所有测试"""
+        print("🚀 Starting bullet pool tests...\n")
+
+        results = {
+            'remove_from_middle': self.test_remove_from_middle(),
+            'grow': self.test_grow(),
+            'cull': self.test_cull(),
+            'numba_numpy_parity': self.test_numba_numpy_parity(),
+        }
+
+        print(f"\n📋 Test Summary:")
+        for test_name, passed in results.items():
+            status = "✅ PASS" if passed else "❌ FAIL"
+            print(f"  {test_name}: {status}")
+
+        passed_tests = sum(results.values())
+        print(f"\nOverall: {passed_tests}/{len(results)} tests passed")
+        return results
+
+
+def main():
+    """主函数"""
+    results = BulletPoolTester().run_all_tests()
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+客户端预测对账测试脚本
+验证服务器回传序号后的输入重放、校正阈值，以及校正后 0.1 秒窗口内的渲染插值
+"""
+
+import os
+import sys
+from collections import deque
+from types import SimpleNamespace
+
+# Add shared and home directories to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'shared'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'home'))
+
+from tank_game_entities import Player, TANK_SPEED
+from tank_game_client import GameClient, DIRECTIONS_BY_BITS
+
+RIGHT = DIRECTIONS_BY_BITS[0b1000]  # d
+DOWN = DIRECTIONS_BY_BITS[0b0100]  # s
+IDLE = DIRECTIONS_BY_BITS[0]
+
+
+def close(a: float, b: float) -> bool:
+    return abs(a - b) < 1e-9
+
+
+class ClientReconciliationTester:
+    """客户端对账测试器"""
+
+    def check(self, condition: bool, message: str) -> bool:
+        """打印失败原因并返回检查结果"""
+        if not condition:
+            print(f"  ❌ {message}")
+        return condition
+
+    def create_local_player(self, x: float, y: float) -> Player:
+        """创建客户端侧的本地玩家（无 websocket）"""
+        player = Player({'player_id': "local", 'name': "Local", 'position': {"x": x, "y": y}})
+        player.is_local_player = True
+        return player
+
+    def reconcile(self, history, player: Player, server_position, ack_seq: int):
+        """以最小的客户端状态调用 GameClient._reconcile_local_player（它只使用输入历史）"""
+        client = SimpleNamespace(_input_history=history)
+        GameClient._reconcile_local_player(client, player, server_position, ack_seq, 1000.0)
+
+    def test_ack_replays_unacknowledged_inputs(self) -> bool:
+        """测试回传序号：丢弃已确认的输入，在服务器位置上重放其余输入"""
+        print("🧪 Testing ack drops acknowledged inputs and replays the rest...")
+        history = deque([
+            (1, 0.1, RIGHT), (1, 0.1, RIGHT),  # 已被服务器处理
+            (2, 0.1, RIGHT), (2, 0.05, DOWN),
+            (3, 0.1, RIGHT),
+        ])
+        # 本地预测位置远离重放结果，确保触发校正，从而可以读出重放后的位置
+        player = self.create_local_player(700.0, 500.0)
+        player.moving_directions = DOWN
+        server_position = {"x": 100.0, "y": 200.0}
+
+        self.reconcile(history, player, server_position, ack_seq=2)
+
+        ok = self.check([entry[0] for entry in history] == [2, 2, 3],
+                        f"history after ack: {[entry[0] for entry in history]}")
+        expected_x = 100.0 + TANK_SPEED * (0.1 + 0.1)
+        expected_y = 200.0 + TANK_SPEED * 0.05
+        position = player.display_position
+        ok &= self.check(close(position["x"], expected_x) and close(position["y"], expected_y),
+                         f"replayed to ({position['x']}, {position['y']}), expected ({expected_x}, {expected_y})")
+        ok &= self.check(player.position == position, "position not synced with display_position")
+        ok &= self.check(server_position == {"x": 100.0, "y": 200.0}, "server position was mutated by the replay")
+        ok &= self.check(player.moving_directions is DOWN, "local key state was replaced by the ack")
+
+        # 确认全部输入后不再重放，直接采用服务器位置
+        self.reconcile(history, player, {"x": 50.0, "y": 60.0}, ack_seq=4)
+        ok &= self.check(not history, f"{len(history)} inputs left after acking everything")
+        ok &= self.check(player.display_position == {"x": 50.0, "y": 60.0},
+                         f"position {player.display_position} after acking everything")
+        return ok
+
+    def test_correction_threshold(self) -> bool:
+        """测试校正阈值：阈值内保留本地预测，超过阈值跳到预测位置并记录插值快照"""
+        print("🧪 Testing correction under and over the threshold...")
+        ok = True
+        threshold = self.create_local_player(0.0, 0.0).correction_threshold
+
+        for offset, corrected in ((threshold * 0.5, False), (threshold, False), (threshold + 0.5, True)):
+            player = self.create_local_player(300.0, 300.0)
+            server_position = {"x": 300.0 + offset, "y": 300.0}
+            self.reconcile(deque(), player, server_position, ack_seq=1)
+
+            label = f"offset {offset:.1f}px"
+            if corrected:
+                ok &= self.check(player.display_position == server_position, f"{label}: not corrected")
+                ok &= self.check(player._snap_prev == {"x": 300.0, "y": 300.0}, f"{label}: snap_prev {player._snap_prev}")
+                ok &= self.check(player._snap_curr == server_position, f"{label}: snap_curr {player._snap_curr}")
+            else:
+                ok &= self.check(player.display_position == {"x": 300.0, "y": 300.0},
+                                 f"{label}: corrected to {player.display_position}")
+                ok &= self.check(player._snap_prev is None, f"{label}: started an interpolation")
+                ok &= self.check(player.base_position == player.display_position,
+                                 f"{label}: base position not reset to the local prediction")
+
+        # 阈值是距离而不是单轴差值
+        player = self.create_local_player(300.0, 300.0)
+        diagonal = threshold * 0.8
+        self.reconcile(deque(), player, {"x": 300.0 + diagonal, "y": 300.0 + diagonal}, ack_seq=1)
+        ok &= self.check(player._snap_prev is not None, "diagonal offset over the threshold was not corrected")
+        return ok
+
+    def test_render_interpolation_window(self) -> bool:
+        """测试渲染插值：在 0.1 秒窗口两端被钳制，窗口结束后清除快照"""
+        print("🧪 Testing render interpolation clamped to the 0.1s window...")
+        player = self.create_local_player(100.0, 100.0)
+        self.reconcile(deque(), player, {"x": 140.0, "y": 70.0}, ack_seq=1)
+        ok = self.check(player._snap_prev is not None, "correction did not start an interpolation")
+        if not ok:
+            return False
+        start = player._snap_time
+        window = player.interpolation_window
+        ok &= self.check(close(window, 0.1), f"interpolation window {window}, expected 0.1")
+
+        # 窗口开始之前（时钟早于快照时间）钳制为起点
+        x, y = player.render_position(start - 0.05)
+        ok &= self.check(close(x, 100.0) and close(y, 100.0), f"before window: ({x}, {y})")
+        x, y = player.render_position(start)
+        ok &= self.check(close(x, 100.0) and close(y, 100.0), f"window start: ({x}, {y})")
+        x, y = player.render_position(start + window / 2)
+        ok &= self.check(close(x, 120.0) and close(y, 85.0), f"window middle: ({x}, {y})")
+
+        # 插值偏移叠加在仍在移动的当前位置上
+        player.update_deterministic_position(0.01)
+        player.moving_directions = RIGHT
+        player.update_deterministic_position(0.01)
+        moved_x = 140.0 + TANK_SPEED * 0.01
+        x, y = player.render_position(start + window * 0.75)
+        ok &= self.check(close(x, moved_x - 40.0 * 0.25) and close(y, 70.0 + 30.0 * 0.25),
+                         f"moving target at 75%: ({x}, {y})")
+
+        # 窗口结束时到达当前位置；超出窗口钳制为当前位置并清除快照，之后不再插值
+        x, y = player.render_position(start + window)
+        ok &= self.check(close(x, moved_x) and close(y, 70.0), f"window end: ({x}, {y})")
+        x, y = player.render_position(start + window * 1.5)
+        ok &= self.check(close(x, moved_x) and close(y, 70.0), f"after window end: ({x}, {y})")
+        ok &= self.check(player._snap_prev is None, "snapshot not cleared after the window")
+        x, y = player.render_position(start)
+        ok &= self.check(close(x, moved_x) and close(y, 70.0), f"after window: ({x}, {y})")
+        return ok
+
+    def run_all_tests(self):
+        """运行所有测试"""
+        print("🚀 Starting client reconciliation tests...\n")
+
+        results = {
+            'ack_replays_unacknowledged_inputs': self.test_ack_replays_unacknowledged_inputs(),
+            'correction_threshold': self.test_correction_threshold(),
+            'render_interpolation_window': self.test_render_interpolation_window(),
+        }
+
+        print(f"\n📋 Test Summary:")
+        for test_name, passed in results.items():
+            status = "✅ PASS" if passed else "❌ FAIL"
+            print(f"  {test_name}: {status}")
+
+        passed_tests = sum(results.values())
+        print(f"\nOverall: {passed_tests}/{len(results)} tests passed")
+        return results
+
+
+def main():
+    """主函数"""
+    results = ClientReconciliationTester().run_all_tests()
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
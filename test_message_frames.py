@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+消息帧编解码测试脚本
+验证打包按键帧（30 字节）的编解码、异常帧处理、服务器按连接补全 player_id，
+以及 json / msgpack 两种子协议下的批量帧
+"""
+
+import asyncio
+import os
+import sys
+
+# Add shared and server directories to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'shared'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'server'))
+
+import msgpack
+
+from tank_game_messages import (
+    KeyStateChangeMessage, PingMessage, PlayerShootMessage, GameMessageType,
+    KEY_STATE_FRAME_TAG, SUBPROTOCOL_JSON, SUBPROTOCOL_MSGPACK,
+    parse_messages, encode_batch, encode_client_frame,
+)
+from tank_game_entities import Player, GameRoom
+
+
+def key_event(keys: str = "", sequence: int = 7, x: float = 123.25, y: float = 456.5) -> KeyStateChangeMessage:
+    """构造按键事件，keys 为按下的键，如 "wd" """
+    return KeyStateChangeMessage(
+        player_id="",
+        key_states={key: key in keys for key in "wasd"},
+        timestamp=1700000000.125,
+        position={"x": x, "y": y},
+        sequence=sequence,
+    )
+
+
+class MessageFrameTester:
+    """消息帧测试器"""
+
+    def check(self, condition: bool, message: str) -> bool:
+        """打印失败原因并返回检查结果"""
+        if not condition:
+            print(f"  ❌ {message}")
+        return condition
+
+    def test_packed_round_trip(self) -> bool:
+        """测试打包 -> 解包往返：字段保持不变，长度固定为 30 字节"""
+        print("🧪 Testing packed key frame round trip...")
+        original = key_event("wd", sequence=4000000000, x=-12.5, y=599.875)
+        frame = original.to_packed()
+        ok = self.check(isinstance(frame, bytes) and len(frame) == 30, f"frame is {len(frame)} bytes, expected 30")
+        ok &= self.check(frame[0] == KEY_STATE_FRAME_TAG, "frame does not start with the tag")
+
+        messages = parse_messages(frame)
+        ok &= self.check(len(messages) == 1 and isinstance(messages[0], KeyStateChangeMessage),
+                         f"parsed {messages}")
+        if not ok:
+            return False
+        decoded = messages[0]
+        ok &= self.check(decoded.key_states == original.key_states, f"key_states {decoded.key_states}")
+        ok &= self.check(decoded.sequence == original.sequence, f"sequence {decoded.sequence}")
+        ok &= self.check(decoded.timestamp == original.timestamp, f"timestamp {decoded.timestamp}")
+        ok &= self.check(decoded.position == original.position, f"position {decoded.position}")
+        ok &= self.check(decoded.player_id == "", "packed frame carried a player id")
+
+        # 未设置序号的事件编码为 0，解码回 None
+        unsequenced = parse_messages(key_event("s", sequence=None).to_packed())[0]
+        ok &= self.check(unsequenced.sequence is None, f"missing sequence decoded as {unsequenced.sequence}")
+        return ok
+
+    def test_key_bitmask(self) -> bool:
+        """测试按键位图映射：w/a/s/d 依次对应 bit 0-3，全部 16 种组合可逆"""
+        print("🧪 Testing key bitmask mapping...")
+        ok = True
+        for key, bit in (("w", 0), ("a", 1), ("s", 2), ("d", 3)):
+            frame = key_event(key).to_packed()
+            ok &= self.check(frame[1] == 1 << bit, f"'{key}' packed as {frame[1]:#x}, expected {1 << bit:#x}")
+
+        for bits in range(16):
+            keys = "".join(key for i, key in enumerate("wasd") if bits & (1 << i))
+            frame = key_event(keys).to_packed()
+            decoded = parse_messages(frame)[0]
+            ok &= self.check(frame[1] == bits, f"{keys!r} packed as {frame[1]:#x}")
+            ok &= self.check(decoded.key_states == {key: key in keys for key in "wasd"},
+                             f"{keys!r} decoded as {decoded.key_states}")
+
+        # 缺失的键视为未按下，其他键被忽略
+        partial = KeyStateChangeMessage(player_id="", key_states={"d": True, "space": True})
+        ok &= self.check(partial.to_packed()[1] == 0b1000, "missing/unknown keys changed the bitmask")
+        return ok
+
+    def test_malformed_frames(self) -> bool:
+        """测试长度错误、未知标签的帧：返回空列表而不是抛异常"""
+        print("🧪 Testing wrong-length and unknown-tag frames...")
+        frame = key_event("w").to_packed()
+        cases = {
+            "empty frame": b"",
+            "truncated key frame": frame[:-1],
+            "oversized key frame": frame + b"\x00",
+            "tag only": bytes([KEY_STATE_FRAME_TAG]),
+            "unknown tag (msgpack scalar)": b"\x02",
+            "unknown tag with payload": b"\x02" + frame[1:],
+            "garbage bytes": b"\xc1\xff\x00",
+            "msgpack map with unknown type": msgpack.packb({"type": "no_such_type"}),
+            "invalid json": "{not json",
+            "json scalar": "42",
+        }
+        ok = True
+        for name, data in cases.items():
+            try:
+                result = parse_messages(data)
+            except Exception as e:
+                ok &= self.check(False, f"{name}: raised {type(e).__name__}: {e}")
+                continue
+            ok &= self.check(result == [], f"{name}: parsed as {result}")
+        return ok
+
+    def test_server_fills_player_id(self) -> bool:
+        """测试服务器用连接的 client_id 补全打包帧中空的 player_id"""
+        print("🧪 Testing server substitutes client_id for packed frames...")
+        from tank_game_server import TankGameServer
+
+        server = TankGameServer(host="127.0.0.1", port=0)
+        client_id = "client-123"
+        player = Player({'player_id': client_id, 'name': "Tester"}, websocket=None)
+        room = GameRoom("room-1", "Room", client_id)
+        room.add_player(player)
+        server.players[client_id] = player
+        server.rooms[room.room_id] = room
+
+        broadcasts = []
+
+        async def capture_broadcast(room_id, message, exclude=None):
+            broadcasts.append((room_id, message))
+
+        server.broadcast_to_room = capture_broadcast
+        frame = key_event("wa", sequence=42, x=player.position["x"] + 1.0, y=player.position["y"]).to_packed()
+        asyncio.run(server.handle_message(None, client_id, frame))
+
+        ok = self.check(len(broadcasts) == 1, f"{len(broadcasts)} broadcasts, expected 1")
+        if not ok:
+            return False
+        room_id, event = broadcasts[0]
+        ok &= self.check(room_id == room.room_id, f"broadcast to {room_id}")
+        ok &= self.check(isinstance(event, KeyStateChangeMessage), f"broadcast {type(event).__name__}")
+        ok &= self.check(event.player_id == client_id, f"player_id {event.player_id!r}, expected {client_id!r}")
+        ok &= self.check(event.sequence == 42, f"sequence {event.sequence} not echoed")
+        ok &= self.check(player.moving_directions == {"w": True, "a": True, "s": False, "d": False},
+                         f"player directions {player.moving_directions}")
+        return ok
+
+    def test_mixed_batches(self) -> bool:
+        """测试两种子协议下混合消息的批量帧，以及客户端帧的编码选择"""
+        print("🧪 Testing mixed batch frames for json and msgpack...")
+        ping = PingMessage(client_id="c1", sequence=3, timestamp=10.0)
+        shoot = PlayerShootMessage(player_id="p1", position={"x": 1.0, "y": 2.0},
+                                   direction={"x": 0.0, "y": -1.0}, bullet_id="b1", timestamp=11.0)
+        key = key_event("s", sequence=9)
+        key.player_id = "p1"
+        batch = [ping, key, shoot]
+
+        ok = True
+        for subprotocol, frame_type in ((SUBPROTOCOL_JSON, str), (SUBPROTOCOL_MSGPACK, bytes)):
+            for encoder in (encode_batch, encode_client_frame):
+                label = f"{encoder.__name__}/{subprotocol}"
+                frame = encoder(batch, subprotocol)
+                ok &= self.check(isinstance(frame, frame_type), f"{label}: frame is {type(frame).__name__}")
+                decoded = parse_messages(frame)
+                ok &= self.check([m.type for m in decoded] == [m.type for m in batch],
+                                 f"{label}: types {[m.type for m in decoded]}")
+                ok &= self.check([m.to_dict() for m in decoded] == [m.to_dict() for m in batch],
+                                 f"{label}: batch contents changed")
+
+                # 单条消息不加批量信封
+                single = encoder([ping], subprotocol)
+                ok &= self.check(single == ping.encode(subprotocol), f"{label}: single message was wrapped")
+
+            # 单个按键事件：仅 msgpack 客户端帧使用打包格式，服务器广播仍为完整消息
+            client_frame = encode_client_frame([key], subprotocol)
+            if subprotocol == SUBPROTOCOL_MSGPACK:
+                ok &= self.check(client_frame == key.to_packed(), "msgpack client key event not packed")
+            else:
+                ok &= self.check(client_frame == key.to_json(), "json client key event not sent as json")
+            ok &= self.check(encode_batch([key], subprotocol) == key.encode(subprotocol),
+                             f"encode_batch/{subprotocol}: key event was packed")
+            decoded = parse_messages(client_frame)
+            ok &= self.check(len(decoded) == 1 and decoded[0].type == GameMessageType.KEY_STATE_CHANGE
+                             and decoded[0].key_states == key.key_states,
+                             f"encode_client_frame/{subprotocol}: single key event decoded as {decoded}")
+        return ok
+
+    def run_all_tests(self):
+        """运行所有测试"""
+        print("🚀 Starting message frame tests...\n")
+
+        results = {
+            'packed_round_trip': self.test_packed_round_trip(),
+            'key_bitmask': self.test_key_bitmask(),
+            'malformed_frames': self.test_malformed_frames(),
+            'server_fills_player_id': self.test_server_fills_player_id(),
+            'mixed_batches': self.test_mixed_batches(),
+        }
+
+        print(f"\n📋 Test Summary:")
+        for test_name, passed in results.items():
+            status = "✅ PASS" if passed else "❌ FAIL"
+            print(f"  {test_name}: {status}")
+
+        passed_tests = sum(results.values())
+        print(f"\nOverall: {passed_tests}/{len(results)} tests passed")
+        return results
+
+
+def main():
+    """主函数"""
+    results = MessageFrameTester().run_all_tests()
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()